@@ -0,0 +1,283 @@
+"""
+Semantic answer cache for the concierge
+
+Stores final answers in a dedicated Qdrant collection, embedded from the
+normalized question plus the sidebar preferences that affect it. A new
+question asked with the same preferences reuses a stored answer when it is
+similar enough. Only the first message of a conversation is looked up or
+stored, since follow-ups depend on earlier turns. Entries expire after Config.ANSWER_CACHE_TTL_SECONDS and are
+deleted when one of the collections they were built from is written.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from langchain_core.messages import ToolMessage
+
+from utils.config import Config
+
+# Collections each tool reads; answers are invalidated when these change
+TOOL_SOURCES = {
+    "search_destinations_tool": ["destinations"],
+    "get_attractions_tool": ["attractions"],
+    "recommend_restaurants_tool": ["restaurants"],
+    "recommend_hotels_tool": ["hotels"],
+    "create_itinerary_tool": ["attractions", "restaurants"],
+    "convert_currency_tool": [],
+}
+
+# Answers built with these tools are time-sensitive and never cached
+UNCACHEABLE_TOOLS = {"get_weather_tool"}
+
+# Messages that refer back to the conversation can't be answered out of context
+REFERENTIAL_PATTERN = re.compile(
+    r"\b(it|its|it's|there|that|those|these|this|them|they|their|he|she|"
+    r"more|else|another|other|instead|also|again|same|above|previous|first one|last one)\b",
+    re.IGNORECASE
+)
+ITINERARY_PATTERN = re.compile(r"\b(itinerar\w*|days?|plan|schedule|trip)\b", re.IGNORECASE)
+
+# Tool results that mean the answer was built on a failure or an empty search
+FAILED_RESULT_PREFIXES = ("Error", "No ", "Location ")
+# Search results found only after relaxing the requested filters
+RELAXED_RESULT_MARKER = '"relaxed_filters":'
+
+# Seconds between deletes of expired entries
+CLEANUP_INTERVAL_SECONDS = 600
+
+
+def normalize_message(message: str) -> str:
+    """Case- and whitespace-normalized message without trailing punctuation"""
+    return " ".join(message.split()).casefold().rstrip("?!. ")
+
+
+def relevant_preferences(message: str, preferences: Optional[Dict]) -> Dict:
+    """Sidebar preferences that can change the answer to this message"""
+    preferences = preferences or {}
+    relevant = {
+        "destination": (preferences.get("destination") or "").strip().casefold(),
+        "budget": preferences.get("budget") or "",
+        "interests": sorted(preferences.get("interests") or []),
+    }
+    if ITINERARY_PATTERN.search(message):
+        relevant["days"] = preferences.get("days")
+    return relevant
+
+
+class SemanticAnswerCache:
+    """
+    Answer cache backed by a Qdrant collection.
+
+    Args:
+        db: QdrantManager
+        collection_name: Collection holding the cached answers
+        threshold: Minimum cosine similarity for a hit
+        ttl_seconds: Lifetime of a cached answer
+    """
+
+    def __init__(
+        self,
+        db,
+        collection_name: str = "answer_cache",
+        threshold: Optional[float] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        self.db = db
+        self.collection_name = collection_name
+        self.threshold = Config.ANSWER_CACHE_THRESHOLD if threshold is None else threshold
+        self.ttl_seconds = Config.ANSWER_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._ready = False
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "skipped": 0, "invalidations": 0, "errors": 0}
+        self._cleaned_at = 0.0
+        # source collection -> time of the last invalidation
+        self._invalidated_at: Dict[str, float] = {}
+        # Stores run off the request path, one at a time
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="answer-cache")
+
+        db.add_write_listener(self.invalidate_source)
+
+    def cacheable(self, message: str) -> bool:
+        """Whether a message stands on its own (no references to earlier turns)"""
+        return not REFERENTIAL_PATTERN.search(message)
+
+    def lookup(self, message: str, preferences: Optional[Dict] = None) -> Optional[str]:
+        """Cached answer for a message and preferences, or None"""
+        if not self.cacheable(message):
+            self._count("skipped")
+            return None
+
+        try:
+            self._ensure_collection()
+            context, text = self._key(message, preferences)
+            results = self.db.search(
+                self.collection_name,
+                text,
+                limit=1,
+                score_threshold=self.threshold,
+                filter={"context": context, "expires_at": {"gt": time.time()}},
+                with_payload=["answer"]
+            )
+        except Exception as e:
+            print(f"Answer cache lookup failed: {e}")
+            self._count("errors")
+            return None
+
+        if not results:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return results[0].payload["answer"]
+
+    def store(
+        self,
+        message: str,
+        answer: str,
+        tools_used: Iterable[str],
+        preferences: Optional[Dict] = None,
+        started_at: Optional[float] = None
+    ) -> bool:
+        """
+        Cache an answer in the background unless it depends on earlier turns or live data.
+
+        Args:
+            message: User message (the first of its conversation)
+            answer: Final answer
+            tools_used: Names of the tools called for the answer
+            preferences: Sidebar preferences the answer was generated with
+            started_at: time.monotonic() when generation started; the answer
+                is dropped if one of its sources was written after that
+
+        Returns:
+            True if the answer was queued for storing
+        """
+        tools_used = set(tools_used)
+        if not answer or not self.cacheable(message) or tools_used & UNCACHEABLE_TOOLS:
+            return False
+
+        sources = sorted({
+            source for tool_name in tools_used for source in TOOL_SOURCES.get(tool_name, [])
+        })
+        if started_at is None:
+            started_at = time.monotonic()
+        self._writer.submit(self._write, message, answer, sources, preferences, started_at)
+        return True
+
+    def _write(self, message: str, answer: str, sources: List[str], preferences: Optional[Dict], started_at: float):
+        """Store one answer (runs on the writer thread)"""
+        # A source written after generation started makes the answer stale
+        with self._lock:
+            if any(self._invalidated_at.get(source, 0.0) >= started_at for source in sources):
+                return
+        context, text = self._key(message, preferences)
+        try:
+            self._ensure_collection()
+            if time.monotonic() - self._cleaned_at >= CLEANUP_INTERVAL_SECONDS:
+                # Lookups already skip expired entries; this just reclaims space
+                self.db.delete_points(self.collection_name, {"expires_at": {"lte": time.time()}})
+                self._cleaned_at = time.monotonic()
+            self.db.add_points(self.collection_name, [{
+                "id": str(uuid.uuid4()),
+                "text": text,
+                "metadata": {
+                    "answer": answer,
+                    "context": context,
+                    "sources": sources,
+                    "expires_at": time.time() + self.ttl_seconds
+                }
+            }])
+        except Exception as e:
+            print(f"Answer cache store failed: {e}")
+            self._count("errors")
+            return
+        self._count("stores")
+
+    def invalidate_source(self, collection_name: str):
+        """Delete cached answers built from a collection (QdrantManager write listener)"""
+        if collection_name == self.collection_name:
+            return
+        with self._lock:
+            self._invalidated_at[collection_name] = time.monotonic()
+        try:
+            self._ensure_collection()
+            self.db.delete_points(self.collection_name, {"sources": [collection_name]})
+            self._count("invalidations")
+        except Exception as e:
+            print(f"Answer cache invalidation failed for {collection_name}: {e}")
+            self._count("errors")
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss, store, skip and invalidation counters plus the hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _key(self, message: str, preferences: Optional[Dict]):
+        """Exact preference context and the text that gets embedded"""
+        relevant = relevant_preferences(message, preferences)
+        context = hashlib.sha256(json.dumps(relevant, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        details = "; ".join(
+            f"{key}: {', '.join(value) if isinstance(value, list) else value}"
+            for key, value in relevant.items() if value
+        )
+        text = normalize_message(message)
+        return context, f"{text}\n{details}" if details else text
+
+    def _ensure_collection(self):
+        """Create the cache collection on first use"""
+        if not self._ready:
+            self.db.create_collection(self.collection_name)
+            self._ready = True
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._stats[counter] += 1
+
+
+_shared_caches: Dict = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_answer_cache(db) -> SemanticAnswerCache:
+    """
+    Answer cache shared by every agent using a QdrantManager.
+
+    Agents are created per session; sharing the cache keeps one write
+    listener (and one invalidation delete per write) per manager.
+    """
+    if db not in _shared_caches:
+        with _shared_caches_lock:
+            if db not in _shared_caches:
+                _shared_caches[db] = SemanticAnswerCache(db)
+    return _shared_caches[db]
+
+
+def tools_used(messages: List) -> List[str]:
+    """Names of the tools called in a graph run's messages"""
+    return [
+        call["name"]
+        for message in messages
+        for call in (getattr(message, "tool_calls", None) or [])
+    ]
+
+
+def tools_failed(messages: List) -> bool:
+    """Whether a tool in a graph run failed, found nothing or had to relax its filters"""
+    for message in messages:
+        if isinstance(message, ToolMessage):
+            content = str(message.content)
+            if (
+                message.status == "error"
+                or content.startswith(FAILED_RESULT_PREFIXES)
+                or RELAXED_RESULT_MARKER in content
+            ):
+                return True
+    return False
@@ -2,16 +2,46 @@
 Tourism Concierge AI Agent using LangGraph with OpenAI
 """
 
-from typing import TypedDict, Annotated, Sequence, List, Dict, Any
+from typing import TypedDict, Annotated, Sequence, List, Dict, Any, Tuple
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, AIMessage, BaseMessage, SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage, BaseMessage, SystemMessage, ToolMessage
 from langchain_core.tools import tool
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import operator
+import threading
+import time
 
 from utils.config import Config
-from database import QdrantManager
+from database import get_qdrant_manager
+from utils.resilience import get_policy
+from agent.answer_cache import get_answer_cache, tools_failed, tools_used
+from agent.memory import ConversationMemory
+from agent.tool_output import compact_itinerary, compact_results, payload_fields
+from agent.router import IntentRouter
+from agent.query_templates import (
+    destination_query, attraction_query, restaurant_query, hotel_query, itinerary_query
+)
+
+
+# Filters dropped when a search finds nothing (LLM-supplied values that may
+# not match the stored spelling)
+RELAXABLE_FILTERS = ("cuisine", "price_range", "budget_level", "type")
+
+# Approximate exchange rates per USD used by convert_currency_tool
+CURRENCY_RATES = {
+    "USD": 1.0, "EUR": 0.92, "TND": 3.15, "GBP": 0.79,
+    "CAD": 1.36, "CHF": 0.88, "MAD": 10.1, "DZD": 134.5
+}
+
+
+def _get_json(url: str) -> Dict:
+    """GET a JSON API (raises on HTTP errors so they can be retried)"""
+    import requests
+
+    response = requests.get(url, timeout=5)
+    response.raise_for_status()
+    return response.json()
 
 
 # Agent State
@@ -38,6 +68,8 @@ Your goal is to help tourists plan their perfect trip by providing:
 - Custom itinerary creation
 
 You have access to tools that can search our database of destinations, attractions, restaurants, and hotels.
+Search tools return compact JSON (descriptions shortened, values shared by all results under "common"); turn it into a friendly, well-formatted answer.
+If a result has "relaxed_filters", nothing matched those criteria exactly; say so and present the results as alternatives.
 
 Guidelines:
 - Be enthusiastic and warm - tourists are planning their dream vacation!
@@ -71,84 +103,150 @@ Always be helpful and aim to create memorable travel experiences!"""
             temperature=0.7
         )
 
-        # Initialize database
-        self.db = QdrantManager()
+        # Shared database manager (pooled connections)
+        self.db = get_qdrant_manager()
+
+        # Build the exact name/location indexes in the background
+        if Config.KEYWORD_INDEX_ENABLED:
+            threading.Thread(target=self.db.build_keyword_indexes, daemon=True).start()
+
+        # Precompute query template embeddings without delaying startup
+        if Config.EMBEDDING_WARMUP_ON_STARTUP:
+            from agent.warmup import warm_up
+            threading.Thread(target=warm_up, args=(self.db,), daemon=True).start()
 
-        # Create tools
+        # Create tools and let the model call them
         self.tools = self._create_tools()
+        self.tools_by_name = {t.name: t for t in self.tools}
+        self.llm_with_tools = self.llm.bind_tools(self.tools)
+
+        # Answers simple currency/weather/destination requests without the LLM
+        self.router = (
+            IntentRouter(self.tools_by_name, self.db, CURRENCY_RATES)
+            if Config.INTENT_ROUTER_ENABLED else None
+        )
+
+        # Reuses answers to near-identical questions asked with the same preferences
+        self.answer_cache = get_answer_cache(self.db) if Config.ANSWER_CACHE_ENABLED else None
+
+        # Token-budgeted history: recent turns verbatim, older turns summarized
+        self.memory = ConversationMemory(self.llm)
+
+        # Runs the tool calls of one model turn concurrently
+        self.tool_executor = ThreadPoolExecutor(
+            max_workers=Config.TOOL_MAX_WORKERS, thread_name_prefix="agent-tool"
+        )
 
         # Build the graph
         self.graph = self._build_graph()
 
+    def _search(
+        self,
+        collection_name: str,
+        query_text: str,
+        limit: int,
+        filter: Dict = None,
+        with_payload=True
+    ) -> Tuple[List, List[str]]:
+        """
+        Search with structured filters.
+
+        If nothing matches, retry without the RELAXABLE_FILTERS
+        (cuisine/price/type values from the LLM may not match the stored
+        payload spelling). Location and range conditions are always kept.
+
+        Returns:
+            (results, names of the filters dropped to get them)
+        """
+        results = self.db.search(
+            collection_name=collection_name,
+            query_text=query_text,
+            limit=limit,
+            filter=filter,
+            with_payload=with_payload
+        )
+        relaxed = [k for k, v in (filter or {}).items() if k in RELAXABLE_FILTERS and v]
+        if not results and relaxed:
+            results = self.db.search(
+                collection_name=collection_name,
+                query_text=query_text,
+                limit=limit,
+                filter={k: v for k, v in filter.items() if k not in relaxed},
+                with_payload=with_payload
+            )
+            return results, relaxed
+        return results, []
+
     def _create_tools(self) -> List:
         """Create agent tools"""
 
         @tool
-        def search_destinations_tool(query: str, region: str = "Tunisia", budget_level: str = "medium") -> str:
+        def search_destinations_tool(query: str, region: str = "Tunisia", budget_level: str = "", min_rating: float = 0) -> str:
             """Search for destinations matching the query.
             Args:
                 query: Search query (e.g., "beach destinations", "historical sites")
                 region: Geographic region (default: Tunisia)
-                budget_level: Budget preference - low/medium/high"""
-            results = self.db.search(
-                collection_name="destinations",
-                query_text=f"{query} in {region}",
-                limit=5
+                budget_level: Optional budget preference - low/medium/high
+                min_rating: Optional minimum rating (0-5)"""
+            results, relaxed = self._search(
+                "destinations",
+                destination_query(query, region),
+                limit=5,
+                filter={
+                    "budget_level": budget_level,
+                    "rating": {"gte": min_rating} if min_rating else None
+                },
+                with_payload=payload_fields("search_destinations_tool")
             )
 
             if not results:
                 return f"No destinations found matching '{query}' in {region}."
 
-            output = f"Found {len(results)} destinations:\n\n"
-            for r in results:
-                dest = r.payload
-                output += f"**{dest.get('name', 'Unknown')}** (similarity: {r.score:.2f})\n"
-                output += f"{dest.get('description', 'No description')}\n"
-                output += f"Best season: {dest.get('best_season', 'N/A')}\n"
-                output += f"Activities: {', '.join(dest.get('activities', []))}\n\n"
-
-            return output
+            return compact_results(
+                "search_destinations_tool",
+                [r.payload for r in results],
+                query=query,
+                relaxed_filters=relaxed or None
+            )
 
         @tool
-        def get_attractions_tool(destination: str, attraction_type: str = "") -> str:
+        def get_attractions_tool(destination: str, attraction_type: str = "", min_rating: float = 0) -> str:
             """Get attractions for a destination.
             Args:
                 destination: Name of the destination
-                attraction_type: Optional filter by type (museum, beach, historical, nature)"""
-            query = f"attractions in {destination}"
-            if attraction_type:
-                query += f" {attraction_type}"
-
-            results = self.db.search(
-                collection_name="attractions",
-                query_text=query,
-                limit=8
+                attraction_type: Optional filter by type (museum, beach, historical, nature)
+                min_rating: Optional minimum rating (0-5)"""
+            results, relaxed = self._search(
+                "attractions",
+                attraction_query(destination, attraction_type),
+                limit=8,
+                filter={
+                    "location": destination,
+                    "type": attraction_type,
+                    "rating": {"gte": min_rating} if min_rating else None
+                },
+                with_payload=payload_fields("get_attractions_tool")
             )
 
             if not results:
                 return f"No attractions found in {destination}."
 
-            output = f"Top attractions in {destination}:\n\n"
-            for r in results:
-                attr = r.payload
-                output += f"**{attr.get('name', 'Unknown')}** ({attr.get('type', 'attraction')})\n"
-                output += f"{attr.get('description', 'No description')}\n"
-                output += f"Rating: {attr.get('rating', 'N/A')}/5 | Hours: {attr.get('opening_hours', 'N/A')}\n"
-                output += f"Entry fee: {attr.get('entry_fee', 'N/A')}\n\n"
-
-            return output
+            return compact_results(
+                "get_attractions_tool",
+                [r.payload for r in results],
+                destination=destination,
+                relaxed_filters=relaxed or None
+            )
 
         @tool
         def get_weather_tool(location: str) -> str:
             """Get current weather and forecast for a location.
             Args:
                 location: City or location name"""
-            import requests
-
             try:
                 # Geocode
                 geo_url = f"https://geocoding-api.open-meteo.com/v1/search?name={location}&count=1"
-                geo_response = requests.get(geo_url, timeout=5).json()
+                geo_response = get_policy("weather").call(_get_json, geo_url)
 
                 if not geo_response.get("results"):
                     return f"Location '{location}' not found."
@@ -159,7 +257,7 @@ Always be helpful and aim to create memorable travel experiences!"""
 
                 # Weather
                 weather_url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current=temperature_2m,weather_code,wind_speed_10m,relative_humidity_2m&daily=weather_code,temperature_2m_max,temperature_2m_min&timezone=auto"
-                weather_response = requests.get(weather_url, timeout=5).json()
+                weather_response = get_policy("weather").call(_get_json, weather_url)
 
                 current = weather_response.get("current", {})
                 daily = weather_response.get("daily", {})
@@ -197,80 +295,73 @@ Always be helpful and aim to create memorable travel experiences!"""
                 amount: Amount to convert
                 from_currency: Source currency (USD, EUR, TND, etc.)
                 to_currency: Target currency"""
-            rates = {
-                "USD": 1.0, "EUR": 0.92, "TND": 3.15, "GBP": 0.79,
-                "CAD": 1.36, "CHF": 0.88, "MAD": 10.1, "DZD": 134.5
-            }
-
-            from_rate = rates.get(from_currency.upper(), 1.0)
-            to_rate = rates.get(to_currency.upper(), 1.0)
+            from_rate = CURRENCY_RATES.get(from_currency.upper(), 1.0)
+            to_rate = CURRENCY_RATES.get(to_currency.upper(), 1.0)
             converted = (amount / from_rate) * to_rate
 
             return f"{amount} {from_currency.upper()} = {converted:.2f} {to_currency.upper()} (Rate: 1 {from_currency.upper()} = {to_rate/from_rate:.4f} {to_currency.upper()})"
 
         @tool
-        def recommend_restaurants_tool(location: str, cuisine_type: str = "", price_range: str = "medium") -> str:
+        def recommend_restaurants_tool(location: str, cuisine_type: str = "", price_range: str = "", min_rating: float = 0) -> str:
             """Recommend restaurants at a location.
             Args:
                 location: City or area name
                 cuisine_type: Type of cuisine (optional)
-                price_range: budget/medium/high-end"""
-            query = f"restaurants in {location}"
-            if cuisine_type:
-                query += f" {cuisine_type} cuisine"
-            if price_range:
-                query += f" {price_range} price"
-
-            results = self.db.search(
-                collection_name="restaurants",
-                query_text=query,
-                limit=5
+                price_range: Optional budget/medium/high-end
+                min_rating: Optional minimum rating (0-5)"""
+            results, relaxed = self._search(
+                "restaurants",
+                restaurant_query(location, cuisine_type, price_range),
+                limit=5,
+                filter={
+                    "location": location,
+                    "cuisine": cuisine_type,
+                    "price_range": price_range,
+                    "rating": {"gte": min_rating} if min_rating else None
+                },
+                with_payload=payload_fields("recommend_restaurants_tool")
             )
 
             if not results:
                 return f"No restaurants found in {location}."
 
-            output = f"Restaurant recommendations in {location}:\n\n"
-            for r in results:
-                rest = r.payload
-                output += f"**{rest.get('name', 'Unknown')}** ({rest.get('cuisine', 'various')})\n"
-                output += f"{rest.get('description', 'No description')}\n"
-                output += f"Price: {rest.get('price_range', 'N/A')} | Rating: {rest.get('rating', 'N/A')}/5\n"
-                output += f"Specialties: {', '.join(rest.get('specialties', []))}\n\n"
-
-            return output
+            return compact_results(
+                "recommend_restaurants_tool",
+                [r.payload for r in results],
+                location=location,
+                relaxed_filters=relaxed or None
+            )
 
         @tool
-        def recommend_hotels_tool(location: str, budget_level: str = "medium", accommodation_type: str = "") -> str:
+        def recommend_hotels_tool(location: str, budget_level: str = "", accommodation_type: str = "", min_rating: float = 0) -> str:
             """Recommend hotels/accommodations at a location.
             Args:
                 location: City or area name
-                budget_level: budget/medium/luxury
-                accommodation_type: hotel/riad/resort (optional)"""
-            query = f"hotels in {location}"
-            if accommodation_type:
-                query += f" {accommodation_type}"
-            if budget_level:
-                query += f" {budget_level}"
-
-            results = self.db.search(
-                collection_name="hotels",
-                query_text=query,
-                limit=5
+                budget_level: Optional budget/medium/luxury
+                accommodation_type: hotel/riad/resort (optional)
+                min_rating: Optional minimum rating (0-5)"""
+            results, relaxed = self._search(
+                "hotels",
+                hotel_query(location, budget_level, accommodation_type),
+                limit=5,
+                filter={
+                    "location": location,
+                    "type": accommodation_type,
+                    "price_range": budget_level,
+                    "rating": {"gte": min_rating} if min_rating else None
+                },
+                with_payload=payload_fields("recommend_hotels_tool")
             )
 
             if not results:
                 return f"No hotels found in {location}."
 
-            output = f"Hotel recommendations in {location}:\n\n"
-            for r in results:
-                hotel = r.payload
-                output += f"**{hotel.get('name', 'Unknown')}** ({hotel.get('type', 'hotel')})\n"
-                output += f"{hotel.get('description', 'No description')}\n"
-                output += f"Price: {hotel.get('price_range', 'N/A')} | Rating: {hotel.get('rating', 'N/A')}/5\n"
-                output += f"Amenities: {', '.join(hotel.get('amenities', []))}\n\n"
-
-            return output
+            return compact_results(
+                "recommend_hotels_tool",
+                [r.payload for r in results],
+                location=location,
+                relaxed_filters=relaxed or None
+            )
 
         @tool
         def create_itinerary_tool(destination: str, days: int, interests: str = "general") -> str:
@@ -279,42 +370,41 @@ Always be helpful and aim to create memorable travel experiences!"""
                 destination: Destination name
                 days: Number of days
                 interests: Travel interests (culture, adventure, food, beach, etc.)"""
-            # Get attractions
-            query = f"attractions in {destination} for {interests} travel"
-            results = self.db.search(
-                collection_name="attractions",
-                query_text=query,
-                limit=days * 3
+            # Get attractions and lunch spots in one embedding + query round trip
+            fields = payload_fields("create_itinerary_tool")
+            attraction_results, restaurant_results = self.db.search_many([
+                {
+                    "collection_name": "attractions",
+                    "query_text": itinerary_query(destination, interests),
+                    "limit": days * 3,
+                    "filter": {"location": destination},
+                    "with_payload": fields
+                },
+                {
+                    "collection_name": "restaurants",
+                    "query_text": restaurant_query(destination),
+                    "limit": days,
+                    "filter": {"location": destination},
+                    "with_payload": fields
+                }
+            ])
+
+            # Destination not matched by any location: fall back to similarity only
+            if not attraction_results:
+                attraction_results = self.db.search(
+                    collection_name="attractions",
+                    query_text=itinerary_query(destination, interests),
+                    limit=days * 3,
+                    with_payload=fields
+                )
+
+            return compact_itinerary(
+                destination,
+                days,
+                [r.payload for r in attraction_results],
+                [r.payload for r in restaurant_results]
             )
 
-            attractions = [r.payload for r in results]
-
-            output = f"**{days}-Day Itinerary for {destination}**\n\n"
-
-            activities_per_day = max(1, len(attractions) // days)
-
-            for day in range(days):
-                day_attractions = attractions[day * activities_per_day:(day + 1) * activities_per_day]
-
-                output += f"### Day {day + 1}\n"
-
-                if day_attractions:
-                    morning = day_attractions[0] if len(day_attractions) > 0 else None
-                    afternoon = day_attractions[1] if len(day_attractions) > 1 else None
-
-                    if morning:
-                        output += f"- **Morning**: Visit {morning.get('name', 'local attraction')} - {morning.get('description', '')[:100]}...\n"
-                    if afternoon:
-                        output += f"- **Afternoon**: Explore {afternoon.get('name', 'local attraction')} - {afternoon.get('description', '')[:100]}...\n"
-
-                output += f"- **Lunch**: Try a local restaurant\n"
-                output += f"- **Evening**: Free time to explore, enjoy local cuisine, or relax\n\n"
-
-            if not attractions:
-                output += f"Note: Limited attraction data for {destination}. The agent can help you find more specific activities!\n"
-
-            return output
-
         return [
             search_destinations_tool,
             get_attractions_tool,
@@ -325,13 +415,51 @@ Always be helpful and aim to create memorable travel experiences!"""
             create_itinerary_tool
         ]
 
+    def _run_tools(self, state: AgentState) -> AgentState:
+        """
+        Run all tool calls from the last model message concurrently.
+
+        Each call gets Config.TOOL_TIMEOUT_SECONDS from the start of the step;
+        failures and timeouts are reported to the model as tool messages.
+        Results are returned in the original call order.
+        """
+        tool_calls = state["messages"][-1].tool_calls
+        start = time.monotonic()
+
+        futures = []
+        for call in tool_calls:
+            selected = self.tools_by_name.get(call["name"])
+            futures.append(
+                self.tool_executor.submit(selected.invoke, call["args"]) if selected else None
+            )
+
+        messages = []
+        for call, future in zip(tool_calls, futures):
+            status = "error"
+            if future is None:
+                content = f"Error: unknown tool '{call['name']}'."
+            else:
+                remaining = max(0.0, start + Config.TOOL_TIMEOUT_SECONDS - time.monotonic())
+                try:
+                    content = str(future.result(timeout=remaining))
+                    status = "success"
+                except FutureTimeoutError:
+                    content = f"Error: {call['name']} timed out after {Config.TOOL_TIMEOUT_SECONDS:g}s."
+                except Exception as e:
+                    content = f"Error: {call['name']} failed: {e}"
+            messages.append(
+                ToolMessage(content=content, name=call["name"], tool_call_id=call["id"], status=status)
+            )
+
+        return {"messages": messages}
+
     def _build_graph(self) -> StateGraph:
         """Build the LangGraph agent graph"""
 
         def call_model(state: AgentState) -> AgentState:
             """Call the LLM with tools"""
             messages = state["messages"]
-            response = self.llm.invoke(messages)
+            response = self.llm_with_tools.invoke(messages)
             return {"messages": [response]}
 
         def should_continue(state: AgentState) -> str:
@@ -348,7 +476,7 @@ Always be helpful and aim to create memorable travel experiences!"""
 
         # Add nodes
         workflow.add_node("agent", call_model)
-        workflow.add_node("tools", ToolNode(self.tools))
+        workflow.add_node("tools", self._run_tools)
 
         # Set entry point
         workflow.set_entry_point("agent")
@@ -368,69 +496,167 @@ Always be helpful and aim to create memorable travel experiences!"""
 
         return workflow.compile()
 
-    def chat(self, message: str, history: List[Dict[str, str]] = None) -> str:
+    @staticmethod
+    def _earlier_turns(message: str, history: List[Dict[str, str]] = None) -> List[Dict[str, str]]:
+        """History before the current message
+
+        `history` may already end with the current message (the UI appends it
+        before asking for a response); it is stripped.
+        """
+        history = list(history or [])
+        if history and history[-1]["role"] == "user" and history[-1]["content"] == message:
+            history.pop()
+        return history
+
+    def _use_answer_cache(self, message: str, history: List[Dict[str, str]] = None) -> bool:
+        """Whether the answer cache applies: only to the first message of a conversation,
+        since later ones ("Any hotels?") depend on what was discussed before"""
+        return self.answer_cache is not None and not self._earlier_turns(message, history)
+
+    def _build_messages(self, message: str, history: List[Dict[str, str]] = None) -> List[BaseMessage]:
+        """System prompt, conversation memory and the new user message"""
+        messages = [SystemMessage(content=self.SYSTEM_PROMPT)]
+
+        # Recent turns within the token budget, older ones as a rolling summary
+        messages.extend(self.memory.messages(self._earlier_turns(message, history)))
+
+        messages.append(HumanMessage(content=message))
+        return messages
+
+    def chat(
+        self,
+        message: str,
+        history: List[Dict[str, str]] = None,
+        preferences: Dict[str, Any] = None
+    ) -> str:
         """Chat with the agent
 
         Args:
             message: User message
             history: Optional chat history as list of {"role": "user|assistant", "content": "..."}
+            preferences: Optional sidebar preferences (destination, budget,
+                interests, days); part of the answer cache key
 
         Returns:
             Agent response
         """
-        # Build messages
-        messages = [SystemMessage(content=self.SYSTEM_PROMPT)]
+        if self.router is not None:
+            routed = self.router.route(message)
+            if routed is not None:
+                return routed
 
-        # Add history
-        if history:
-            for item in history[-5:]:  # Keep last 5 messages
-                if item["role"] == "user":
-                    messages.append(HumanMessage(content=item["content"]))
-                elif item["role"] == "assistant":
-                    messages.append(AIMessage(content=item["content"]))
+        use_cache = self._use_answer_cache(message, history)
+        if use_cache:
+            cached = self.answer_cache.lookup(message, preferences)
+            if cached is not None:
+                return cached
 
-        # Add current message
-        messages.append(HumanMessage(content=message))
+        # Writes to the answer's sources from here on make it stale
+        started_at = time.monotonic()
 
         # Invoke graph
-        result = self.graph.invoke({"messages": messages})
+        result = self.graph.invoke({"messages": self._build_messages(message, history)})
 
         # Get last AI message
         ai_messages = [m for m in result["messages"] if isinstance(m, AIMessage)]
-        if ai_messages:
-            return ai_messages[-1].content
+        if ai_messages and ai_messages[-1].content:
+            answer = ai_messages[-1].content
+            # Answers built on failed or empty tool results are not reused
+            if use_cache and not tools_failed(result["messages"]):
+                self.answer_cache.store(
+                    message, answer, tools_used(result["messages"]), preferences, started_at
+                )
+            return answer
 
         return "I apologize, but I couldn't process your request. Please try again."
 
-    def chat_stream(self, message: str, history: List[Dict[str, str]] = None):
-        """Stream chat responses for real-time UI updates
+    def chat_stream(
+        self,
+        message: str,
+        history: List[Dict[str, str]] = None,
+        preferences: Dict[str, Any] = None
+    ):
+        """Stream chat responses token by token for real-time UI updates
 
         Args:
             message: User message
             history: Optional chat history
+            preferences: Optional sidebar preferences (see `chat`)
 
         Yields:
-            Response chunks
+            Event dicts:
+                {"type": "token", "content": str} - text generated by the model
+                {"type": "reset"} - discard the text so far (it preceded tool
+                    calls and is not part of the answer)
+                {"type": "tool_start", "id": str, "name": str, "args": dict} - tool call requested
+                {"type": "tool_end", "id": str, "name": str, "content": str} - tool result
         """
-        # Build messages
-        messages = [SystemMessage(content=self.SYSTEM_PROMPT)]
-
-        if history:
-            for item in history[-5:]:
-                if item["role"] == "user":
-                    messages.append(HumanMessage(content=item["content"]))
-                elif item["role"] == "assistant":
-                    messages.append(AIMessage(content=item["content"]))
-
-        messages.append(HumanMessage(content=message))
+        if self.router is not None:
+            intent = self.router.match(message)
+            if intent is not None:
+                if intent["tool"]:
+                    yield {"type": "tool_start", "id": "router", "name": intent["tool"], "args": intent["args"]}
+                answer = self.router.answer(intent)
+                if intent["tool"]:
+                    yield {"type": "tool_end", "id": "router", "name": intent["tool"], "content": answer or ""}
+                if answer is not None:
+                    self.router.record(intent)
+                    yield {"type": "token", "content": answer}
+                    return
+            self.router.record(None)
+
+        use_cache = self._use_answer_cache(message, history)
+        if use_cache:
+            cached = self.answer_cache.lookup(message, preferences)
+            if cached is not None:
+                yield {"type": "token", "content": cached}
+                return
+
+        # Text of the current model turn, the tools called so far and their
+        # results (for the answer cache)
+        answer = []
+        called = []
+        results = []
+
+        started_at = time.monotonic()
+        stream = self.graph.stream(
+            {"messages": self._build_messages(message, history)},
+            stream_mode=["messages", "updates"]
+        )
 
-        # Stream from graph
-        for event in self.graph.stream({"messages": messages}):
-            for node_name, node_output in event.items():
-                if node_name == "agent":
-                    for msg in node_output.get("messages", []):
-                        if isinstance(msg, AIMessage) and msg.content:
-                            yield msg.content
+        for mode, payload in stream:
+            if mode == "messages":
+                chunk, metadata = payload
+                if metadata.get("langgraph_node") == "agent" and isinstance(chunk.content, str) and chunk.content:
+                    answer.append(chunk.content)
+                    yield {"type": "token", "content": chunk.content}
+            else:
+                for node_name, node_output in payload.items():
+                    for msg in (node_output or {}).get("messages", []):
+                        if node_name == "agent":
+                            if getattr(msg, "tool_calls", None) and answer:
+                                # Text before a tool call is not the final answer
+                                answer.clear()
+                                yield {"type": "reset"}
+                            for call in getattr(msg, "tool_calls", None) or []:
+                                called.append(call["name"])
+                                yield {
+                                    "type": "tool_start",
+                                    "id": call["id"],
+                                    "name": call["name"],
+                                    "args": call["args"]
+                                }
+                        elif node_name == "tools" and isinstance(msg, ToolMessage):
+                            results.append(msg)
+                            yield {
+                                "type": "tool_end",
+                                "id": msg.tool_call_id,
+                                "name": msg.name,
+                                "content": msg.content
+                            }
+
+        if use_cache and answer and not tools_failed(results):
+            self.answer_cache.store(message, "".join(answer), called, preferences, started_at)
 
 
 def create_agent() -> TourismConciergeAgent:
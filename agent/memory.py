@@ -0,0 +1,191 @@
+"""
+Token-budgeted conversation memory with a rolling summary
+
+Recent turns are sent verbatim as long as they fit in
+Config.MEMORY_RECENT_TOKENS; older turns are folded into a running summary
+by the chat model. The summary is updated incrementally (only the newly
+folded turns are sent), so prompt size stays bounded however long the
+conversation gets.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Dict, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from utils.config import Config
+
+SUMMARY_PROMPT = """Update the running summary of a travel-planning conversation between a tourist and a Tunisia tourism concierge.
+
+Current summary:
+{summary}
+
+New turns to fold in:
+{turns}
+
+Write the updated summary in at most {words} words. Keep the traveller's destinations, dates, budget, interests, group, decisions made and places already recommended (names only). Drop greetings and detailed descriptions."""
+
+_encoding = None
+_encoding_loaded = False
+
+
+def count_tokens(text: str) -> int:
+    """Tokens in `text` for the chat model (tiktoken if available, else ~4 characters per token)"""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            try:
+                _encoding = tiktoken.encoding_for_model(Config.CHAT_MODEL)
+            except KeyError:
+                _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            # Not installed, or the encoding file can't be downloaded
+            print(f"tiktoken unavailable, estimating tokens: {e}")
+            _encoding = None
+
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return len(text) // 4 + 1
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Shorten text to roughly `max_tokens` tokens"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    # Character estimate first, then trim until it fits
+    cut = text[:max_tokens * 4]
+    while cut and count_tokens(cut) > max_tokens:
+        cut = cut[:int(len(cut) * 0.9)]
+    return cut.rstrip() + " […]"
+
+
+def _fingerprint(turns: List[Dict[str, str]]) -> str:
+    """Identifies the already-summarized prefix of a conversation"""
+    raw = json.dumps([[t["role"], t["content"]] for t in turns]).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class ConversationMemory:
+    """
+    Builds the history part of the prompt for one conversation.
+
+    Args:
+        llm: Chat model used to update the summary (without tools)
+        recent_tokens: Budget for verbatim recent turns
+        message_tokens: Cap for any single verbatim message
+        summary_words: Target length of the running summary
+    """
+
+    def __init__(
+        self,
+        llm,
+        recent_tokens: Optional[int] = None,
+        message_tokens: Optional[int] = None,
+        summary_words: Optional[int] = None
+    ):
+        self.llm = llm
+        self.recent_tokens = recent_tokens or Config.MEMORY_RECENT_TOKENS
+        self.message_tokens = message_tokens or Config.MEMORY_MESSAGE_TOKENS
+        self.summary_words = summary_words or Config.MEMORY_SUMMARY_WORDS
+
+        self.summary = ""
+        self._summarized = 0  # number of history turns folded into the summary
+        self._fingerprint = _fingerprint([])
+        self._lock = threading.Lock()
+        self._stats = {"summaries": 0, "summary_failures": 0, "history_tokens": 0}
+
+    def messages(self, history: List[Dict[str, str]]) -> List[BaseMessage]:
+        """
+        Summary plus recent turns for the prompt.
+
+        Args:
+            history: Full chat history as {"role": "user|assistant", "content": "..."}
+                (without the current message)
+
+        Returns:
+            Messages to place between the system prompt and the new user message
+        """
+        turns = [t for t in history if t.get("role") in ("user", "assistant")]
+
+        with self._lock:
+            # A different or shortened conversation: start over
+            if (
+                len(turns) < self._summarized
+                or _fingerprint(turns[:self._summarized]) != self._fingerprint
+            ):
+                self.summary = ""
+                self._summarized = 0
+                self._fingerprint = _fingerprint([])
+
+            sizes = [
+                min(count_tokens(t["content"]), self.message_tokens) for t in turns
+            ]
+            recent_start = self._recent_start(sizes)
+
+            if recent_start > self._summarized:
+                # Fold down to half the budget so summaries aren't needed every turn
+                fold_to = self._recent_start(sizes, self.recent_tokens // 2)
+                self._fold(turns[self._summarized:fold_to])
+                self._summarized = fold_to
+                self._fingerprint = _fingerprint(turns[:fold_to])
+
+            recent = turns[self._summarized:]
+            messages: List[BaseMessage] = []
+            if self.summary:
+                messages.append(SystemMessage(content=f"Summary of the earlier conversation:\n{self.summary}"))
+            for turn in recent:
+                content = _truncate(turn["content"], self.message_tokens)
+                messages.append(
+                    HumanMessage(content=content) if turn["role"] == "user" else AIMessage(content=content)
+                )
+
+            self._stats["history_tokens"] = (
+                count_tokens(self.summary) + sum(sizes[self._summarized:])
+            )
+        return messages
+
+    def stats(self) -> Dict[str, int]:
+        """Summaries written, failures, turns summarized and history tokens in the last prompt"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["summarized_turns"] = self._summarized
+            stats["summary_tokens"] = count_tokens(self.summary) if self.summary else 0
+        return stats
+
+    def _recent_start(self, sizes: List[int], budget: Optional[int] = None) -> int:
+        """Index of the oldest turn that still fits in the budget (counting back from the end)"""
+        budget = self.recent_tokens if budget is None else budget
+        total = 0
+        start = len(sizes)
+        while start > 0 and total + sizes[start - 1] <= budget:
+            start -= 1
+            total += sizes[start]
+        return start
+
+    def _fold(self, turns: List[Dict[str, str]]):
+        """Merge turns into the running summary (caller holds the lock)"""
+        if not turns:
+            return
+        transcript = "\n".join(
+            f"{'Tourist' if t['role'] == 'user' else 'Concierge'}: {_truncate(t['content'], self.message_tokens)}"
+            for t in turns
+        )
+        prompt = SUMMARY_PROMPT.format(
+            summary=self.summary or "(none yet)", turns=transcript, words=self.summary_words
+        )
+        try:
+            self.summary = str(self.llm.invoke([HumanMessage(content=prompt)]).content).strip()
+            self._stats["summaries"] += 1
+        except Exception as e:
+            # Keep a short extract rather than losing the turns
+            print(f"Conversation summary failed: {e}")
+            self._stats["summary_failures"] += 1
+            extract = " ".join(
+                f"{'Tourist' if t['role'] == 'user' else 'Concierge'}: {_truncate(t['content'], 40)}"
+                for t in turns
+            )
+            self.summary = _truncate(f"{self.summary} {extract}".strip(), self.summary_words * 2)
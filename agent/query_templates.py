@@ -0,0 +1,41 @@
+"""
+Search query templates shared by the agent tools and the embedding warm-up
+"""
+
+
+def destination_query(query: str, region: str = "Tunisia") -> str:
+    """Query text for search_destinations_tool"""
+    return f"{query} in {region}"
+
+
+def attraction_query(destination: str, attraction_type: str = "") -> str:
+    """Query text for get_attractions_tool"""
+    query = f"attractions in {destination}"
+    if attraction_type:
+        query += f" {attraction_type}"
+    return query
+
+
+def restaurant_query(location: str, cuisine_type: str = "", price_range: str = "") -> str:
+    """Query text for recommend_restaurants_tool"""
+    query = f"restaurants in {location}"
+    if cuisine_type:
+        query += f" {cuisine_type} cuisine"
+    if price_range:
+        query += f" {price_range} price"
+    return query
+
+
+def hotel_query(location: str, budget_level: str = "", accommodation_type: str = "") -> str:
+    """Query text for recommend_hotels_tool"""
+    query = f"hotels in {location}"
+    if accommodation_type:
+        query += f" {accommodation_type}"
+    if budget_level:
+        query += f" {budget_level}"
+    return query
+
+
+def itinerary_query(destination: str, interests: str = "general") -> str:
+    """Query text for create_itinerary_tool"""
+    return f"attractions in {destination} for {interests} travel"
@@ -0,0 +1,182 @@
+"""
+Deterministic intent router in front of the LLM graph
+
+Recognizes simple, unambiguous requests (currency conversion, weather for a
+place, "tell me about <destination>") with anchored patterns, runs the tool
+directly and formats the answer from a template. Anything else returns None
+and goes to the LLM.
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, Optional
+
+# Currency words accepted in place of ISO codes
+CURRENCY_ALIASES = {
+    "$": "USD", "dollar": "USD", "dollars": "USD", "usd": "USD",
+    "€": "EUR", "euro": "EUR", "euros": "EUR", "eur": "EUR",
+    "£": "GBP", "pound": "GBP", "pounds": "GBP", "gbp": "GBP",
+    "dinar": "TND", "dinars": "TND", "tnd": "TND",
+    "franc": "CHF", "francs": "CHF", "chf": "CHF",
+    "dirham": "MAD", "dirhams": "MAD", "mad": "MAD",
+    "cad": "CAD", "dzd": "DZD",
+}
+
+CURRENCY_PATTERN = re.compile(
+    r"^(?:please\s+)?(?:convert|change|exchange|how much is|what(?:'s| is))?\s*"
+    r"(?P<prefix>[$€£])?\s*(?P<amount>\d+(?:,\d{3})*(?:\.\d+)?)\s*(?P<source>[A-Za-z]+)?"
+    r"\s+(?:to|in|into)\s+(?P<target>[$€£]|[A-Za-z]+)\s*[?.!]*$",
+    re.IGNORECASE
+)
+WEATHER_PATTERN = re.compile(
+    r"^(?:what(?:'s| is)|how(?:'s| is))\s+the\s+weather(?:\s+like)?(?:\s+forecast)?"
+    r"\s+(?:in|for|at)\s+(?P<location>[^\W\d_][\w\s'-]*?)"
+    r"(?:\s+(?:today|now|right now|this week))?\s*[?.!]*$",
+    re.IGNORECASE
+)
+LOOKUP_PATTERN = re.compile(
+    r"^(?:tell me about|what is|what's|describe|info(?:rmation)? (?:on|about))\s+"
+    r"(?P<name>[^\W\d_][\w\s'-]*?)\s*[?.!]*$",
+    re.IGNORECASE
+)
+
+# A place name is at most this many words and contains none of CLAUSE_WORDS
+# (otherwise the message says more than the template can answer)
+MAX_PLACE_WORDS = 4
+CLAUSE_WORDS = {
+    "and", "or", "but", "if", "should", "would", "could", "will", "can", "do",
+    "does", "with", "vs", "versus", "compared", "when", "why", "how", "which",
+}
+
+TEMPLATES = {
+    "currency": "{result}\n\nRates are approximate; check the exact rate with your bank or an exchange office.",
+    "weather": "{result}\nWant suggestions for what to do there in this weather? Just ask!",
+}
+
+
+def _currency_code(token: Optional[str], supported: set) -> Optional[str]:
+    """ISO code for a currency token if it is supported"""
+    if not token:
+        return None
+    code = CURRENCY_ALIASES.get(token.lower(), token.upper())
+    return code if code in supported else None
+
+
+def _is_place(text: str) -> bool:
+    """Whether a captured phrase looks like a single place name"""
+    words = text.lower().split()
+    return 0 < len(words) <= MAX_PLACE_WORDS and not CLAUSE_WORDS & set(words)
+
+
+def _destination_answer(destination: Dict) -> str:
+    """Template for a single destination payload"""
+    name = destination.get("name", "Unknown")
+    lines = [f"**{name}**" + (f" ({destination['region']})" if destination.get("region") else "")]
+    lines.append("")
+    lines.append(destination.get("description", "No description available."))
+    details = []
+    if destination.get("best_season"):
+        details.append(f"- Best season: {destination['best_season']}")
+    if destination.get("activities"):
+        details.append(f"- Activities: {', '.join(destination['activities'])}")
+    if destination.get("budget_level"):
+        details.append(f"- Budget level: {destination['budget_level']}")
+    if details:
+        lines.append("")
+        lines.extend(details)
+    lines.append("")
+    lines.append(f"Would you like attractions, restaurants or hotels in {name}?")
+    return "\n".join(lines)
+
+
+class IntentRouter:
+    """
+    Rule-based fast path for high-confidence intents.
+
+    Args:
+        tools_by_name: Agent tools keyed by name
+        db: QdrantManager used for destination lookups
+        currencies: Currency codes the conversion tool supports
+    """
+
+    def __init__(self, tools_by_name: Dict, db, currencies: Iterable[str]):
+        self.tools_by_name = tools_by_name
+        self.db = db
+        self.currencies = set(currencies)
+        self._lock = threading.Lock()
+        self._stats = {"currency": 0, "weather": 0, "lookup": 0, "fallthrough": 0}
+
+    def match(self, message: str) -> Optional[Dict]:
+        """
+        Classify a message.
+
+        Returns:
+            {"intent": str, "tool": str or None, "args": dict}, or None if the
+            message needs the LLM
+        """
+        text = " ".join(message.split())
+
+        currency = CURRENCY_PATTERN.match(text)
+        if currency:
+            source = _currency_code(currency.group("prefix") or currency.group("source"), self.currencies)
+            target = _currency_code(currency.group("target"), self.currencies)
+            if source and target and source != target:
+                return {
+                    "intent": "currency",
+                    "tool": "convert_currency_tool",
+                    "args": {
+                        "amount": float(currency.group("amount").replace(",", "")),
+                        "from_currency": source,
+                        "to_currency": target
+                    }
+                }
+            return None
+
+        weather = WEATHER_PATTERN.match(text)
+        if weather and _is_place(weather.group("location")):
+            return {
+                "intent": "weather",
+                "tool": "get_weather_tool",
+                "args": {"location": weather.group("location").strip()}
+            }
+
+        lookup = LOOKUP_PATTERN.match(text)
+        if lookup and _is_place(lookup.group("name")):
+            return {"intent": "lookup", "tool": None, "args": {"name": lookup.group("name").strip()}}
+
+        return None
+
+    def answer(self, intent: Dict) -> Optional[str]:
+        """Run a matched intent; None means it could not be answered confidently"""
+        if intent["intent"] == "lookup":
+            # Only an exact, unique destination name counts
+            hits = self.db.keyword_lookup("destinations", intent["args"]["name"], limit=2)
+            if not hits or len(hits) != 1:
+                return None
+            return _destination_answer(hits[0].payload)
+
+        result = str(self.tools_by_name[intent["tool"]].invoke(intent["args"]))
+        # Failures and unknown locations are left to the LLM (it may fix spelling)
+        if result.startswith(("Error", "Location")):
+            return None
+        return TEMPLATES[intent["intent"]].format(result=result)
+
+    def route(self, message: str) -> Optional[str]:
+        """Templated answer for a high-confidence intent, or None to use the LLM"""
+        intent = self.match(message)
+        answer = self.answer(intent) if intent else None
+        self.record(intent if answer is not None else None)
+        return answer
+
+    def record(self, intent: Optional[Dict]):
+        """Count a routed intent (None = fell through to the LLM)"""
+        with self._lock:
+            self._stats[intent["intent"] if intent else "fallthrough"] += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Routed counts per intent, fall-throughs and the routed share"""
+        with self._lock:
+            stats = dict(self._stats)
+        total = sum(stats.values())
+        stats["routed_rate"] = (total - stats["fallthrough"]) / total if total else 0.0
+        return stats
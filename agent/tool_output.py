@@ -0,0 +1,146 @@
+"""
+Compact tool results for the agent
+
+Tool results are fed back into the next model call, so they are returned as
+compact JSON instead of markdown: only the fields configured for the tool
+(Config.TOOL_OUTPUTS), shortened descriptions and lists, duplicates removed,
+values shared by every result stated once, and trailing results dropped to
+stay under the tool's token cap.
+"""
+
+import json
+from typing import Dict, List, Optional
+
+from agent.memory import count_tokens
+from utils.config import Config
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _shorten(text: str, max_chars: int) -> str:
+    """Cut text at a word boundary"""
+    text = " ".join(str(text).split())
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0]
+    return cut.rstrip(",;:.") + "…"
+
+
+def payload_fields(tool_name: str) -> Optional[List[str]]:
+    """Payload fields a tool needs from Qdrant (None = all)"""
+    return Config.tool_output_settings(tool_name)["fields"]
+
+
+def compact_payload(payload: Dict, settings: Dict) -> Dict:
+    """Configured fields of a payload with empty values dropped and long values shortened"""
+    fields = settings["fields"] or list(payload)
+    item = {}
+    for field in fields:
+        value = payload.get(field)
+        if value is None or value == "" or value == []:
+            continue
+        if field == "description":
+            value = _shorten(value, settings["description_chars"])
+        elif isinstance(value, list):
+            value = value[:settings["list_items"]]
+        item[field] = value
+    return item
+
+
+def _dedupe(items: List[Dict]) -> List[Dict]:
+    """Drop repeated results (same name), keeping the first"""
+    seen = set()
+    unique = []
+    for item in items:
+        key = str(item.get("name", "")).casefold() or _dumps(item)
+        if key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
+
+
+def _fit(data: Dict, list_key: str, max_tokens: int) -> str:
+    """Serialize, dropping entries from the end of data[list_key] until under max_tokens"""
+    output = _dumps(data)
+    while count_tokens(output) > max_tokens and len(data[list_key]) > 1:
+        data[list_key].pop()
+        data["omitted"] = data.get("omitted", 0) + 1
+        output = _dumps(data)
+    return output
+
+
+def compact_results(tool_name: str, payloads: List[Dict], **context) -> str:
+    """
+    Compact JSON for a tool's search results.
+
+    Args:
+        tool_name: Tool name (selects Config.TOOL_OUTPUTS settings)
+        payloads: Result payloads, best first
+        **context: Extra top-level keys (e.g. the location searched)
+
+    Returns:
+        {"<context>": ..., "common": {...}, "results": [...], "omitted": n}
+    """
+    settings = Config.tool_output_settings(tool_name)
+    results = _dedupe([compact_payload(payload, settings) for payload in payloads])
+
+    data = {key: value for key, value in context.items() if value not in (None, "")}
+
+    # Values every result shares (e.g. the location filtered on) are stated once
+    common = {}
+    if len(results) > 1:
+        for field, value in results[0].items():
+            if field not in ("name", "description") and all(r.get(field) == value for r in results[1:]):
+                common[field] = value
+        for result in results:
+            for field in common:
+                del result[field]
+    common = {field: value for field, value in common.items() if data.get(field) != value}
+    if common:
+        data["common"] = common
+    data["results"] = results
+    return _fit(data, "results", settings["max_tokens"])
+
+
+def compact_itinerary(
+    destination: str,
+    days: int,
+    attractions: List[Dict],
+    restaurants: List[Dict]
+) -> str:
+    """
+    Compact JSON day plan: each day names its places, details are listed once.
+
+    Args:
+        destination: Destination name
+        days: Number of days
+        attractions: Attraction payloads, best first
+        restaurants: Restaurant payloads, best first
+
+    Returns:
+        {"destination", "days", "plan": [...], "places": [...]}
+    """
+    settings = Config.tool_output_settings("create_itinerary_tool")
+    attractions = _dedupe([compact_payload(payload, settings) for payload in attractions])
+    restaurants = _dedupe([compact_payload(payload, settings) for payload in restaurants])
+
+    per_day = max(1, len(attractions) // days)
+    plan = []
+    for day in range(days):
+        day_attractions = attractions[day * per_day:(day + 1) * per_day]
+        entry = {"day": day + 1}
+        for slot, attraction in zip(("morning", "afternoon"), day_attractions):
+            entry[slot] = attraction.get("name")
+        if day < len(restaurants):
+            entry["lunch"] = restaurants[day].get("name")
+        plan.append(entry)
+
+    data = {"destination": destination, "days": days, "plan": plan}
+    if not attractions:
+        data["note"] = f"Limited attraction data for {destination}"
+    # Details only for places that made it into the plan
+    planned = {value for entry in plan for key, value in entry.items() if key != "day"}
+    data["places"] = [place for place in attractions + restaurants if place.get("name") in planned]
+    return _fit(data, "places", settings["max_tokens"])
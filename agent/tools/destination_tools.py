@@ -27,10 +27,10 @@ def search_destinations(
     Returns:
         Dictionary with matching destinations and details
     """
-    # Import QdrantManager here to avoid circular imports
-    from database import QdrantManager
+    # Import the shared manager here to avoid circular imports
+    from database import get_qdrant_manager
 
-    qdrant = QdrantManager()
+    qdrant = get_qdrant_manager()
 
     # Build search query
     search_text = query
@@ -84,9 +84,9 @@ def get_attractions(
     Returns:
         Dictionary with attractions and details
     """
-    from database import QdrantManager
+    from database import get_qdrant_manager
 
-    qdrant = QdrantManager()
+    qdrant = get_qdrant_manager()
 
     query_text = f"attractions in {destination}"
     if attraction_type:
@@ -95,7 +95,8 @@ def get_attractions(
     results = qdrant.search(
         collection_name="attractions",
         query_text=query_text,
-        limit=8
+        limit=8,
+        filter={"location": destination, "type": attraction_type}
     )
 
     attractions = []
@@ -11,7 +11,7 @@ def recommend_restaurants(
     tool_context: ToolContext,
     location: str,
     cuisine_type: Optional[str] = None,
-    price_range: Optional[str] = "medium"
+    price_range: Optional[str] = None
 ) -> Dict:
     """
     Recommend restaurants at a location.
@@ -24,9 +24,9 @@ def recommend_restaurants(
     Returns:
         List of restaurant recommendations
     """
-    from database import QdrantManager
+    from database import get_qdrant_manager
 
-    qdrant = QdrantManager()
+    qdrant = get_qdrant_manager()
 
     query_text = f"restaurants in {location}"
     if cuisine_type:
@@ -37,7 +37,8 @@ def recommend_restaurants(
     results = qdrant.search(
         collection_name="restaurants",
         query_text=query_text,
-        limit=5
+        limit=5,
+        filter={"location": location, "cuisine": cuisine_type, "price_range": price_range}
     )
 
     restaurants = []
@@ -64,7 +65,7 @@ def recommend_restaurants(
 def recommend_hotels(
     tool_context: ToolContext,
     location: str,
-    budget_level: Optional[str] = "medium",
+    budget_level: Optional[str] = None,
     accommodation_type: Optional[str] = None
 ) -> Dict:
     """
@@ -78,9 +79,9 @@ def recommend_hotels(
     Returns:
         List of accommodation recommendations
     """
-    from database import QdrantManager
+    from database import get_qdrant_manager
 
-    qdrant = QdrantManager()
+    qdrant = get_qdrant_manager()
 
     query_text = f"hotels in {location}"
     if accommodation_type:
@@ -91,7 +92,8 @@ def recommend_hotels(
     results = qdrant.search(
         collection_name="hotels",
         query_text=query_text,
-        limit=5
+        limit=5,
+        filter={"location": location, "type": accommodation_type, "price_range": budget_level}
     )
 
     hotels = []
@@ -6,6 +6,15 @@ import requests
 from typing import Dict, Optional
 from google.adk.tools import AgentTool
 
+from utils.resilience import get_policy
+
+
+def _get_json(url: str) -> Dict:
+    """GET a JSON API (raises on HTTP errors so they can be retried)"""
+    response = requests.get(url, timeout=5)
+    response.raise_for_status()
+    return response.json()
+
 
 @AgentTool
 def get_weather(
@@ -27,18 +36,18 @@ def get_weather(
     try:
         # First geocode the location
         geocode_url = f"https://geocoding-api.open-meteo.com/v1/search?name={location}&count=1"
-        geo_response = requests.get(geocode_url, timeout=5).json()
+        geo_response = get_policy("weather").call(_get_json, geocode_url)
 
         if not geo_response.get("results"):
             return {"error": f"Location '{location}' not found", "location": location}
 
         lat = geo_response["results"][0]["latitude"]
-        lon = geo_response["results"][0]["latitude"]
+        lon = geo_response["results"][0]["longitude"]
         name = geo_response["results"][0]["name"]
 
         # Get weather data
         weather_url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current=temperature_2m,weather_code,wind_speed_10m,relative_humidity_2m&daily=weather_code,temperature_2m_max,temperature_2m_min&timezone=auto"
-        weather_response = requests.get(weather_url, timeout=5).json()
+        weather_response = get_policy("weather").call(_get_json, weather_url)
 
         current = weather_response.get("current", {})
         daily = weather_response.get("daily", {})
@@ -142,9 +151,9 @@ def create_itinerary(
     Returns:
         Structured itinerary with daily plans
     """
-    from database import QdrantManager
+    from database import get_qdrant_manager
 
-    qdrant = QdrantManager()
+    qdrant = get_qdrant_manager()
 
     # Get attractions for the destination
     query_text = f"attractions in {destination}"
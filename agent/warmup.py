@@ -0,0 +1,161 @@
+"""
+Embedding warm-up for the agent tools' query templates
+
+Enumerates the query strings the tools build for known locations, cuisines and
+budget levels, and embeds the ones missing from the embedding cache so common
+tool calls never hit the embedding API.
+
+Run with: python -m agent.warmup
+"""
+
+from itertools import product
+from typing import Dict, List
+
+from agent.query_templates import (
+    destination_query, attraction_query, restaurant_query, hotel_query, itinerary_query
+)
+from utils.embeddings import batch_texts, cached_texts, get_embeddings, get_embedding_cache_stats
+from utils.images import DESTINATION_IMAGES
+
+# Values the LLM commonly passes as tool arguments
+DESTINATION_QUERIES = [
+    "beach destinations", "historical sites", "desert adventures",
+    "cultural destinations", "best places to visit"
+]
+ATTRACTION_TYPES = ["", "museum", "beach", "historical", "nature"]
+CUISINES = ["", "Tunisian", "Seafood", "Mediterranean", "French", "Italian"]
+PRICE_RANGES = ["", "budget", "medium", "high-end"]
+BUDGET_LEVELS = ["", "budget", "medium", "luxury"]
+ACCOMMODATION_TYPES = ["", "hotel", "riad", "resort"]
+INTERESTS = ["general", "culture", "history", "adventure", "food", "beach", "nature"]
+
+
+def known_values(manager=None) -> Dict[str, List[str]]:
+    """
+    Locations and cuisines to expand the templates with.
+
+    Args:
+        manager: Optional QdrantManager; payload values from the collections
+            are added to the built-in lists
+
+    Returns:
+        Dict with sorted "locations" and "cuisines" lists
+    """
+    locations = {name.title() for name in DESTINATION_IMAGES}
+    cuisines = {cuisine for cuisine in CUISINES if cuisine}
+
+    if manager is not None:
+        for point in manager.iter_points("destinations", with_payload=["name"]):
+            if point.payload.get("name"):
+                locations.add(point.payload["name"])
+        for collection in ("attractions", "restaurants", "hotels"):
+            for point in manager.iter_points(collection, with_payload=["location", "cuisine"]):
+                if point.payload.get("location"):
+                    locations.add(point.payload["location"])
+                if collection == "restaurants" and point.payload.get("cuisine"):
+                    cuisines.add(point.payload["cuisine"])
+
+    return {"locations": sorted(locations), "cuisines": sorted(cuisines)}
+
+
+def template_queries(locations: List[str], cuisines: List[str]) -> Dict[str, List[str]]:
+    """All query strings per tool template for the given values"""
+    cuisine_options = [""] + cuisines
+    return {
+        "search_destinations": [
+            destination_query(query) for query in DESTINATION_QUERIES
+        ],
+        "get_attractions": [
+            attraction_query(location, attraction_type)
+            for location, attraction_type in product(locations, ATTRACTION_TYPES)
+        ],
+        "recommend_restaurants": [
+            restaurant_query(location, cuisine, price)
+            for location, cuisine, price in product(locations, cuisine_options, PRICE_RANGES)
+        ],
+        "recommend_hotels": [
+            hotel_query(location, budget, accommodation)
+            for location, budget, accommodation in product(locations, BUDGET_LEVELS, ACCOMMODATION_TYPES)
+        ],
+        "create_itinerary": [
+            itinerary_query(location, interests)
+            for location, interests in product(locations, INTERESTS)
+        ],
+    }
+
+
+def warm_up(manager=None, dry_run: bool = False) -> Dict:
+    """
+    Embed every template combination that is not cached yet.
+
+    Args:
+        manager: Optional QdrantManager used to discover locations and cuisines
+        dry_run: Only report coverage, don't call the embedding API
+
+    Returns:
+        Report with per-template coverage and embedding cache stats
+    """
+    values = known_values(manager)
+    queries = template_queries(values["locations"], values["cuisines"])
+
+    report = {"templates": {}, "locations": len(values["locations"]), "cuisines": len(values["cuisines"])}
+    to_embed = []
+    for template, texts in queries.items():
+        texts = list(dict.fromkeys(texts))
+        cached = cached_texts(texts)
+        missing = [text for text, hit in zip(texts, cached) if not hit]
+        to_embed.extend(missing)
+        report["templates"][template] = {
+            "queries": len(texts),
+            "cached_before": len(texts) - len(missing),
+            "embedded": 0 if dry_run else len(missing)
+        }
+
+    if not dry_run:
+        to_embed = list(dict.fromkeys(to_embed))
+        for start, end in batch_texts(to_embed):
+            get_embeddings(to_embed[start:end], bulk=True)
+
+    total = sum(t["queries"] for t in report["templates"].values())
+    cached_before = sum(t["cached_before"] for t in report["templates"].values())
+    report["queries"] = total
+    report["coverage_before"] = cached_before / total if total else 1.0
+    report["coverage_after"] = report["coverage_before"] if dry_run else 1.0
+    report["cache"] = get_embedding_cache_stats()
+    return report
+
+
+def print_report(report: Dict):
+    """Print a warm-up report"""
+    print(f"Locations: {report['locations']} | Cuisines: {report['cuisines']}")
+    print(f"{'Template':<24}{'Queries':>10}{'Cached':>10}{'Embedded':>10}")
+    for template, counts in report["templates"].items():
+        print(
+            f"{template:<24}{counts['queries']:>10}"
+            f"{counts['cached_before']:>10}{counts['embedded']:>10}"
+        )
+    print(
+        f"Template coverage: {report['coverage_before']:.1%} before, "
+        f"{report['coverage_after']:.1%} after"
+    )
+    if report["cache"]:
+        print(f"Embedding cache hit rate (this process): {report['cache']['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute embeddings for tool query templates")
+    parser.add_argument("--dry-run", action="store_true", help="Only report template coverage")
+    parser.add_argument(
+        "--no-db", action="store_true",
+        help="Don't read locations and cuisines from Qdrant"
+    )
+    args = parser.parse_args()
+
+    manager = None
+    if not args.no_db:
+        from database import get_qdrant_manager
+        manager = get_qdrant_manager()
+
+    print_report(warm_up(manager, dry_run=args.dry_run))
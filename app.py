@@ -106,12 +106,67 @@ def generate_response(user_message: str) -> str:
     try:
         return st.session_state.agent.chat(
             message=user_message,
-            history=st.session_state.messages
+            history=st.session_state.messages,
+            preferences=st.session_state.preferences
         )
     except Exception as e:
         return f"I encountered an error: {str(e)}\n\nPlease try rephrasing your question."
 
 
+# Status labels for tool calls shown while a response streams
+TOOL_LABELS = {
+    "search_destinations_tool": "Searching destinations",
+    "get_attractions_tool": "Finding attractions",
+    "get_weather_tool": "Checking the weather",
+    "convert_currency_tool": "Converting currency",
+    "recommend_restaurants_tool": "Finding restaurants",
+    "recommend_hotels_tool": "Finding hotels",
+    "create_itinerary_tool": "Building your itinerary",
+}
+
+
+def stream_response(user_message: str, status) -> str:
+    """
+    Render the response as the agent generates it, reporting tool calls in `status`.
+
+    Returns:
+        The final answer (text streamed before a tool call is dropped)
+    """
+    if st.session_state.agent is None:
+        response = "I apologize, but the AI agent is not available. Please check your configuration."
+        st.markdown(response)
+        return response
+
+    placeholder = st.empty()
+    response = ""
+    try:
+        for event in st.session_state.agent.chat_stream(
+            message=user_message,
+            history=st.session_state.messages,
+            preferences=st.session_state.preferences
+        ):
+            if event["type"] == "token":
+                response += event["content"]
+                placeholder.markdown(response + "▌")
+            elif event["type"] == "reset":
+                response = ""
+                placeholder.empty()
+            elif event["type"] == "tool_start":
+                label = TOOL_LABELS.get(event["name"], event["name"])
+                status.update(label=f"{label}...", state="running")
+                status.write(f"{label}...")
+            elif event["type"] == "tool_end":
+                status.write(f"✓ {TOOL_LABELS.get(event['name'], event['name'])}")
+                status.update(label="Writing the answer...")
+    except Exception as e:
+        response = f"I encountered an error: {str(e)}\n\nPlease try rephrasing your question."
+    finally:
+        status.update(label="Done", state="complete", expanded=False)
+
+    placeholder.markdown(response)
+    return response
+
+
 # Header
 def render_header():
     """Render the main header"""
@@ -499,11 +554,10 @@ def render_chat():
         with st.chat_message("user"):
             st.markdown(prompt)
 
-        # Generate response
+        # Stream the response as it is generated
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                response = generate_response(prompt)
-                st.markdown(response)
+            status = st.status("Thinking...", expanded=False)
+            response = stream_response(prompt, status)
 
         # Add assistant response
         st.session_state.messages.append({"role": "assistant", "content": response})
@@ -1,4 +1,5 @@
 # Database Package - Qdrant Vector Store
-from .qdrant_setup import QdrantManager
+from .qdrant_setup import QdrantManager, get_qdrant_manager
+from .async_qdrant import AsyncQdrantManager
 
-__all__ = ["QdrantManager"]
+__all__ = ["QdrantManager", "AsyncQdrantManager", "get_qdrant_manager"]
@@ -0,0 +1,263 @@
+"""
+Async Qdrant Vector Database Manager
+"""
+
+import asyncio
+from typing import AsyncIterator, List, Dict, Optional, Union
+
+import httpx
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import PointStruct, Record
+
+from database.qdrant_setup import (
+    _build_filter, _hnsw_config, _index_schema, _layout_search_dimensions, _point_vector,
+    _quantization_config, _query_request, _vectors_config
+)
+from utils.config import Config
+from utils.embeddings import get_embedding, get_embeddings, batch_texts
+
+
+class AsyncQdrantManager:
+    """
+    Coroutine counterpart of QdrantManager backed by AsyncQdrantClient.
+
+    Embedding calls run in worker threads (they share the embedding cache and
+    coalescer with the sync code); Qdrant calls run on the event loop, over
+    gRPC when Config.QDRANT_PREFER_GRPC is set.
+    """
+
+    def __init__(self):
+        Config.validate()
+        self.client = AsyncQdrantClient(
+            url=Config.QDRANT_URL,
+            api_key=Config.QDRANT_API_KEY,
+            prefer_grpc=Config.QDRANT_PREFER_GRPC,
+            grpc_port=Config.QDRANT_GRPC_PORT,
+            timeout=Config.QDRANT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=Config.QDRANT_POOL_SIZE,
+                max_keepalive_connections=Config.QDRANT_POOL_SIZE,
+                keepalive_expiry=Config.QDRANT_KEEPALIVE_SECONDS
+            )
+        )
+        self._layouts: Dict[str, Optional[int]] = {}
+
+    async def close(self):
+        """Close the underlying client connections"""
+        await self.client.close()
+
+    async def create_collection(self, collection_name: str):
+        """Create a new collection if it doesn't exist"""
+        if not await self.client.collection_exists(collection_name):
+            settings = Config.collection_settings(collection_name)
+            await self.client.create_collection(
+                collection_name=collection_name,
+                vectors_config=_vectors_config(collection_name),
+                hnsw_config=_hnsw_config(settings),
+                quantization_config=_quantization_config(settings),
+                on_disk_payload=settings["on_disk_payload"]
+            )
+            self._layouts.pop(collection_name, None)
+            print(f"Created collection: {collection_name}")
+        else:
+            print(f"Collection already exists: {collection_name}")
+
+        await self.create_payload_indexes(collection_name)
+
+    async def create_payload_indexes(self, collection_name: str):
+        """Create the payload indexes configured for a collection that don't exist yet"""
+        indexes = Config.collection_settings(collection_name)["indexes"]
+        existing = (await self.client.get_collection(collection_name)).payload_schema
+
+        for field, index_type in indexes.items():
+            if field not in existing:
+                await self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field,
+                    field_schema=_index_schema(index_type)
+                )
+                print(f"Created {index_type} index on {collection_name}.{field}")
+
+    async def _search_dimensions(self, collection_name: str) -> Optional[int]:
+        """First-pass vector size of an existing collection (None if single-vector)"""
+        if collection_name not in self._layouts:
+            info = await self.client.get_collection(collection_name)
+            self._layouts[collection_name] = _layout_search_dimensions(info)
+        return self._layouts[collection_name]
+
+    async def add_points(
+        self,
+        collection_name: str,
+        points: List[Dict],
+        max_workers: Optional[int] = None
+    ) -> int:
+        """
+        Add points to a collection.
+
+        Embedding batches run concurrently (at most `max_workers` at a time)
+        and each batch is upserted in chunks as soon as it is embedded.
+
+        Args:
+            collection_name: Name of the collection
+            points: List of dicts with 'id', 'text', and optional 'metadata'
+            max_workers: Concurrent embedding requests (default: Config.INGEST_MAX_WORKERS)
+
+        Returns:
+            Number of points upserted
+        """
+        semaphore = asyncio.Semaphore(max_workers or Config.INGEST_MAX_WORKERS)
+        search_dimensions = await self._search_dimensions(collection_name)
+        texts = [point.get("text", "") for point in points]
+
+        async def ingest(start: int, end: int) -> int:
+            async with semaphore:
+                embeddings = await asyncio.to_thread(get_embeddings, texts[start:end], bulk=True)
+                structs = [
+                    PointStruct(
+                        id=point["id"],
+                        vector=_point_vector(search_dimensions, embedding),
+                        payload={**point.get("metadata", {}), "text": text}
+                    )
+                    for point, text, embedding in zip(points[start:end], texts[start:end], embeddings)
+                ]
+                for chunk_start in range(0, len(structs), Config.UPSERT_CHUNK_SIZE):
+                    await self.client.upsert(
+                        collection_name=collection_name,
+                        points=structs[chunk_start:chunk_start + Config.UPSERT_CHUNK_SIZE]
+                    )
+                return len(structs)
+
+        counts = await asyncio.gather(*(ingest(start, end) for start, end in batch_texts(texts)))
+        upserted = sum(counts)
+        print(f"Upserted {upserted}/{len(points)} points into {collection_name}")
+        return upserted
+
+    async def search(
+        self,
+        collection_name: str,
+        query_text: str,
+        limit: int = 5,
+        score_threshold: float = 0.5,
+        filter: Optional[Dict] = None,
+        with_payload: Union[bool, List[str]] = True
+    ) -> List:
+        """
+        Search a collection by query text.
+
+        Args:
+            collection_name: Name of the collection
+            query_text: Search query
+            limit: Max results
+            score_threshold: Minimum similarity score
+            filter: Optional metadata filter
+            with_payload: True, False or a list of payload fields to return
+
+        Returns:
+            List of search results
+        """
+        query_vector = await asyncio.to_thread(get_embedding, query_text)
+        request = _query_request(
+            collection_name, await self._search_dimensions(collection_name),
+            query_vector, limit, score_threshold, _build_filter(collection_name, filter),
+            with_payload
+        )
+
+        results = await self.client.query_batch_points(
+            collection_name=collection_name,
+            requests=[request]
+        )
+
+        return results[0].points
+
+    async def search_many(self, searches: List[Dict]) -> List[List]:
+        """
+        Run several searches with one embedding request and one batch query per collection.
+
+        Args:
+            searches: List of dicts with 'collection_name', 'query_text' and
+                optional 'limit', 'score_threshold', 'filter' and 'with_payload'
+
+        Returns:
+            List of search results per search, in input order
+        """
+        if not searches:
+            return []
+
+        texts = list(dict.fromkeys(item["query_text"] for item in searches))
+        vectors = dict(zip(texts, await asyncio.to_thread(get_embeddings, texts)))
+
+        by_collection: Dict[str, List[int]] = {}
+        for i, item in enumerate(searches):
+            by_collection.setdefault(item["collection_name"], []).append(i)
+
+        async def run_batch(collection_name: str, indices: List[int]) -> List:
+            search_dimensions = await self._search_dimensions(collection_name)
+            requests = [
+                _query_request(
+                    collection_name, search_dimensions,
+                    vectors[searches[i]["query_text"]],
+                    searches[i].get("limit", 5),
+                    searches[i].get("score_threshold", 0.5),
+                    _build_filter(collection_name, searches[i].get("filter")),
+                    searches[i].get("with_payload", True)
+                )
+                for i in indices
+            ]
+            return await self.client.query_batch_points(
+                collection_name=collection_name,
+                requests=requests
+            )
+
+        responses = await asyncio.gather(*(
+            run_batch(collection_name, indices)
+            for collection_name, indices in by_collection.items()
+        ))
+
+        results: List[List] = [[] for _ in searches]
+        for indices, batch in zip(by_collection.values(), responses):
+            for i, response in zip(indices, batch):
+                results[i] = response.points
+
+        return results
+
+    async def iter_points(
+        self,
+        collection_name: str,
+        page_size: Optional[int] = None,
+        with_payload: Union[bool, List[str]] = True,
+        with_vectors: Union[bool, List[str]] = False,
+        filter: Optional[Dict] = None
+    ) -> AsyncIterator[Record]:
+        """Lazily iterate over every point in a collection (see QdrantManager.iter_points)"""
+        scroll_filter = _build_filter(collection_name, filter)
+        offset = None
+        while True:
+            records, offset = await self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=scroll_filter,
+                limit=page_size or Config.SCROLL_PAGE_SIZE,
+                offset=offset,
+                with_payload=with_payload,
+                with_vectors=with_vectors
+            )
+            for record in records:
+                yield record
+            if offset is None:
+                return
+
+    async def get_all_points(self, collection_name: str) -> List[Dict]:
+        """Get all points from a collection (loads them all; prefer iter_points for large collections)"""
+        return [
+            {"id": point.id, "payload": point.payload}
+            async for point in self.iter_points(collection_name)
+        ]
+
+    async def delete_collection(self, collection_name: str):
+        """Delete a collection"""
+        await self.client.delete_collection(collection_name=collection_name)
+        self._layouts.pop(collection_name, None)
+        print(f"Deleted collection: {collection_name}")
+
+    async def init_collections(self):
+        """Initialize all required collections"""
+        await asyncio.gather(*(self.create_collection(name) for name in Config.COLLECTIONS))
@@ -0,0 +1,205 @@
+"""
+Exact-name keyword index
+
+Inverted index over the payload `name` and `location` fields of a collection.
+Queries that consist only of known names/locations plus filler words
+("tell me about Sidi Bou Said", "attractions in El Jem") are answered from the
+index without an embedding call or vector search.
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from qdrant_client.models import ScoredPoint
+
+from database.mirror import payload_matches
+
+
+# Payload fields indexed for exact lookups (name hits rank before location hits)
+KEYWORD_FIELDS = ("name", "location")
+
+# Words allowed around a name or location for the query to take the fast path
+STOPWORDS = {
+    "a", "an", "the", "in", "at", "of", "for", "to", "near", "around", "and",
+    "about", "tell", "me", "us", "what", "whats", "is", "are", "show", "find",
+    "info", "information", "details", "visit", "visiting", "best", "top",
+    "please", "some", "any",
+    "destination", "destinations", "attraction", "attractions", "restaurant",
+    "restaurants", "hotel", "hotels", "place", "places", "tunisia",
+}
+
+# Longest name/location phrase matched, in tokens
+MAX_PHRASE_TOKENS = 8
+
+# Seconds to wait before retrying a failed build
+BUILD_RETRY_SECONDS = 30
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase word tokens with accents removed ("Sidi Bou Saïd" -> sidi, bou, said)"""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return re.findall(r"\w+", stripped.casefold().replace("'", ""))
+
+
+def _phrases(value) -> Set[Tuple[str, ...]]:
+    """Index keys for a payload value: the full phrase and the phrase without stopwords"""
+    keys = set()
+    for item in value if isinstance(value, (list, tuple)) else [value]:
+        tokens = normalize_tokens(item)
+        for phrase in (tokens, [t for t in tokens if t not in STOPWORDS]):
+            if 0 < len(phrase) <= MAX_PHRASE_TOKENS:
+                keys.add(tuple(phrase))
+    return keys
+
+
+class KeywordIndex:
+    """
+    Phrase index for one collection.
+
+    Built lazily from Qdrant (or by `load`), then kept in sync by
+    QdrantManager as points are upserted or deleted.
+    """
+
+    def __init__(self, collection_name: str):
+        self.collection_name = collection_name
+        # field -> phrase -> point ids
+        self._postings: Dict[str, Dict[Tuple[str, ...], Set]] = {f: {} for f in KEYWORD_FIELDS}
+        self._payloads: Dict = {}
+        self._ready = False
+        self._retry_at = 0.0
+        self._lock = threading.RLock()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been built"""
+        return self._ready
+
+    def load(self, manager):
+        """Build the index from every point in the collection"""
+        with self._lock:
+            self._clear()
+            for record in manager.iter_points(self.collection_name):
+                self._add(record.id, record.payload or {})
+            self._ready = True
+            print(f"Indexed {len(self._payloads)} {self.collection_name} names")
+
+    def ensure_loaded(self, manager) -> bool:
+        """Build the index on first use; returns False if Qdrant could not be read"""
+        if not self._ready and time.monotonic() >= self._retry_at:
+            with self._lock:
+                if not self._ready and time.monotonic() >= self._retry_at:
+                    try:
+                        self.load(manager)
+                    except Exception as e:
+                        self._retry_at = time.monotonic() + BUILD_RETRY_SECONDS
+                        print(f"Keyword index build failed for {self.collection_name}: {e}")
+        return self._ready
+
+    def add(self, points: Iterable):
+        """Index upserted points (PointStruct or records with id and payload)"""
+        with self._lock:
+            if not self._ready:
+                return
+            for point in points:
+                self._remove(point.id)
+                self._add(point.id, point.payload or {})
+
+    def remove(self, point_ids: Iterable):
+        """Drop deleted points from the index"""
+        with self._lock:
+            for point_id in point_ids:
+                self._remove(point_id)
+
+    def clear(self):
+        """Empty the index (collection deleted)"""
+        with self._lock:
+            self._clear()
+            self._ready = True
+
+    def invalidate(self):
+        """Rebuild from Qdrant on next use (bulk writes that bypass `add`)"""
+        with self._lock:
+            self._clear()
+            self._ready = False
+
+    def search(self, query_text: str, limit: int = 5, filter: Optional[Dict] = None) -> Optional[List[ScoredPoint]]:
+        """
+        Answer a query made only of indexed names/locations and stopwords.
+
+        Args:
+            query_text: Search query
+            limit: Max results
+            filter: Optional metadata filter (same format as QdrantManager.search)
+
+        Returns:
+            Matching points (score 1.0, name hits first, then by rating), or
+            None if the query is open-ended and needs vector search
+        """
+        tokens = normalize_tokens(query_text)
+        with self._lock:
+            matched = {field: set() for field in KEYWORD_FIELDS}
+            i = 0
+            while i < len(tokens):
+                # Longest indexed phrase starting at this token
+                for end in range(min(len(tokens), i + MAX_PHRASE_TOKENS), i, -1):
+                    phrase = tuple(tokens[i:end])
+                    hits = [f for f in KEYWORD_FIELDS if phrase in self._postings[f]]
+                    if hits:
+                        for field in hits:
+                            matched[field] |= self._postings[field][phrase]
+                        i = end
+                        break
+                else:
+                    if tokens[i] not in STOPWORDS:
+                        return None
+                    i += 1
+
+            ranked = []
+            seen = set()
+            for field in KEYWORD_FIELDS:
+                ids = [
+                    point_id for point_id in matched[field]
+                    if point_id not in seen
+                    and payload_matches(self.collection_name, self._payloads[point_id], filter)
+                ]
+                ids.sort(key=lambda point_id: -(self._payloads[point_id].get("rating") or 0))
+                seen.update(ids)
+                ranked.extend(ids)
+
+            if not any(matched.values()):
+                return None
+            return [
+                ScoredPoint(id=point_id, version=0, score=1.0, payload=self._payloads[point_id])
+                for point_id in ranked[:limit]
+            ]
+
+    def _add(self, point_id, payload: Dict):
+        """Index one point (caller holds the lock)"""
+        self._payloads[point_id] = payload
+        for field in KEYWORD_FIELDS:
+            if payload.get(field):
+                for phrase in _phrases(payload[field]):
+                    self._postings[field].setdefault(phrase, set()).add(point_id)
+
+    def _remove(self, point_id):
+        """Unindex one point (caller holds the lock)"""
+        payload = self._payloads.pop(point_id, None)
+        if payload is None:
+            return
+        for field in KEYWORD_FIELDS:
+            if payload.get(field):
+                for phrase in _phrases(payload[field]):
+                    ids = self._postings[field].get(phrase)
+                    if ids is not None:
+                        ids.discard(point_id)
+                        if not ids:
+                            del self._postings[field][phrase]
+
+    def _clear(self):
+        """Drop all entries (caller holds the lock)"""
+        self._postings = {field: {} for field in KEYWORD_FIELDS}
+        self._payloads = {}
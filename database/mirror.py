@@ -0,0 +1,217 @@
+"""
+In-process search mirror for small collections
+
+Holds a collection's full-size vectors in a contiguous float32 matrix and
+answers searches with an exact cosine top-k, applying the same filter
+semantics as the Qdrant filters built by `database.qdrant_setup`.
+"""
+
+import math
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+from qdrant_client.models import ScoredPoint
+
+from utils.config import Config
+from utils.embeddings import get_embedding_dimensions
+
+
+def _words(value) -> set:
+    """Lowercased word tokens (matches the "text" payload index tokenizer)"""
+    return set(re.findall(r"\w+", str(value).lower()))
+
+
+def _values(value) -> list:
+    """Payload value as a list (array payloads match if any element matches)"""
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _condition_matches(collection_name: str, key: str, expected, payload: Dict) -> bool:
+    """Evaluate one filter entry against a payload (see _field_condition)"""
+    actual = payload.get(key)
+    if actual is None:
+        return False
+
+    if isinstance(expected, dict):
+        if "radius" in expected:
+            if not isinstance(actual, dict) or "lat" not in actual or "lon" not in actual:
+                return False
+            return _haversine_meters(
+                expected["lat"], expected["lon"], actual["lat"], actual["lon"]
+            ) <= expected["radius"]
+        checks = {
+            "gt": lambda v, bound: v > bound,
+            "gte": lambda v, bound: v >= bound,
+            "lt": lambda v, bound: v < bound,
+            "lte": lambda v, bound: v <= bound,
+        }
+        return any(
+            isinstance(v, (int, float)) and not isinstance(v, bool) and all(
+                checks[op](v, bound) for op, bound in expected.items() if bound is not None
+            )
+            for v in _values(actual)
+        )
+
+    if isinstance(expected, (list, tuple, set)):
+        return any(v in expected for v in _values(actual))
+
+    indexes = Config.collection_settings(collection_name)["indexes"]
+    if indexes.get(key) == "text":
+        wanted = _words(expected)
+        return any(wanted <= _words(v) for v in _values(actual))
+    return expected in _values(actual)
+
+
+def _haversine_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in meters"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * 6_371_000 * math.asin(math.sqrt(a))
+
+
+def payload_matches(collection_name: str, payload: Dict, filter: Optional[Dict]) -> bool:
+    """Whether a payload passes a {field: value} filter (None and "" values are ignored)"""
+    if not filter:
+        return True
+    return all(
+        _condition_matches(collection_name, key, value, payload)
+        for key, value in filter.items()
+        if value is not None and value != ""
+    )
+
+
+class CollectionMirror:
+    """
+    RAM copy of one collection's vectors and payloads.
+
+    The mirror reloads lazily on the next search once it is older than
+    `refresh_seconds` or has been invalidated by a write. A failed reload keeps
+    serving the previous copy, so searches continue through Qdrant outages.
+    """
+
+    def __init__(self, collection_name: str, refresh_seconds: Optional[float] = None):
+        self.collection_name = collection_name
+        self.refresh_seconds = (
+            Config.MIRROR_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        )
+        self._ids: List = []
+        self._payloads: List[Dict] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._loaded_at = 0.0
+        self._stale = True
+        self._reload_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """Whether a copy has been loaded"""
+        return self._matrix is not None
+
+    def invalidate(self):
+        """Reload on the next search (called after writes to the collection)"""
+        self._stale = True
+
+    def refresh_if_due(self, manager) -> bool:
+        """
+        Reload from Qdrant if stale or expired.
+
+        Only one thread reloads at a time; others keep using the current copy.
+
+        Returns:
+            True if the mirror can serve searches
+        """
+        due = self._stale or time.monotonic() - self._loaded_at > self.refresh_seconds
+        if due and self._reload_lock.acquire(blocking=not self.ready):
+            try:
+                self.load(manager)
+            except Exception as e:
+                # Keep serving the old copy; try again after the refresh interval
+                print(f"Mirror refresh failed for {self.collection_name}: {e}")
+                self._loaded_at = time.monotonic()
+                self._stale = False
+            finally:
+                self._reload_lock.release()
+        return self.ready
+
+    def load(self, manager):
+        """Load all vectors and payloads of the collection through `manager`"""
+        count = manager.client.count(collection_name=self.collection_name, exact=True).count
+        if count > Config.MIRROR_MAX_POINTS:
+            raise ValueError(f"{count} points exceeds MIRROR_MAX_POINTS ({Config.MIRROR_MAX_POINTS})")
+
+        from database.qdrant_setup import FULL_VECTOR, _full_vector
+
+        named = manager._search_dimensions(self.collection_name) is not None
+        ids, payloads, vectors = [], [], []
+        for record in manager.iter_points(
+            self.collection_name,
+            with_vectors=[FULL_VECTOR] if named else True
+        ):
+            ids.append(record.id)
+            payloads.append(record.payload or {})
+            vectors.append(_full_vector(record.vector))
+
+        if vectors:
+            matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.where(norms == 0, 1, norms)
+        else:
+            # Empty (new or cleared) collection
+            matrix = np.zeros((0, get_embedding_dimensions()), dtype=np.float32)
+
+        # Swap in the new copy in one step so concurrent searches see a consistent view
+        self._ids, self._payloads, self._matrix = ids, payloads, matrix
+        self._loaded_at = time.monotonic()
+        self._stale = False
+        print(f"Mirrored {len(ids)} points from {self.collection_name}")
+
+    def search(
+        self,
+        query_vector: List[float],
+        limit: int = 5,
+        score_threshold: Optional[float] = None,
+        filter: Optional[Dict] = None
+    ) -> List[ScoredPoint]:
+        """
+        Exact cosine top-k over the mirrored vectors.
+
+        Args:
+            query_vector: Full-size query embedding
+            limit: Max results
+            score_threshold: Minimum cosine similarity
+            filter: Optional metadata filter (same format as QdrantManager.search)
+
+        Returns:
+            ScoredPoint results, best first
+        """
+        ids, payloads, matrix = self._ids, self._payloads, self._matrix
+        if matrix is None or not len(ids) or limit <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        scores = matrix @ (query / norm if norm else query)
+
+        if filter:
+            mask = np.fromiter(
+                (payload_matches(self.collection_name, payload, filter) for payload in payloads),
+                dtype=bool, count=len(payloads)
+            )
+            scores = np.where(mask, scores, -np.inf)
+        if score_threshold is not None:
+            scores = np.where(scores >= score_threshold, scores, -np.inf)
+
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            ScoredPoint(id=ids[i], version=0, score=float(scores[i]), payload=payloads[i])
+            for i in top
+            if np.isfinite(scores[i])
+        ]
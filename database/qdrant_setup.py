@@ -2,11 +2,358 @@
 Qdrant Vector Database Manager
 """
 
+import hashlib
+import json
+import os
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import math
+import threading
+import httpx
+import numpy as np
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue
-from typing import List, Dict, Optional
+from qdrant_client.models import (
+    Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue,
+    MatchAny, MatchText, Range, GeoRadius, GeoPoint, PayloadSchemaType,
+    TextIndexParams, TextIndexType, TokenizerType, Prefetch, QueryRequest,
+    SearchParams, QuantizationSearchParams, HnswConfigDiff, VectorParamsDiff,
+    CollectionParamsDiff, ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    ProductQuantization, ProductQuantizationConfig, CompressionRatio,
+    BinaryQuantization, BinaryQuantizationConfig, Disabled, Record, PointIdsList,
+    FilterSelector, ScoredPoint
+)
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Union
+from database.keyword_index import KeywordIndex
+from database.mirror import CollectionMirror
+from database.result_cache import SearchResultCache, search_cache_key
+from database.routing import ReplicaRouter
 from utils.config import Config
-from utils.embeddings import get_embedding
+from utils.resilience import get_policy
+from utils.embeddings import (
+    get_embedding, get_embeddings, get_embedding_dimensions, embedding_provider_name,
+    embedding_truncatable, batch_texts
+)
+
+
+# Named vectors used by collections with reduced-dimension search
+FAST_VECTOR = "fast"
+FULL_VECTOR = "full"
+
+
+def _truncate_vector(vector: List[float], size: int) -> List[float]:
+    """Shorten a Matryoshka embedding to `size` dimensions and re-normalize"""
+    head = vector[:size]
+    norm = math.sqrt(sum(v * v for v in head))
+    return [v / norm for v in head] if norm else head
+
+
+def _full_vector(vector) -> List[float]:
+    """Full-size vector from a stored point (single or named vectors)"""
+    return vector[FULL_VECTOR] if isinstance(vector, dict) else vector
+
+
+def _field_condition(collection_name: str, key: str, value) -> FieldCondition:
+    """
+    Condition for one filter entry.
+
+    Values can be a scalar (exact match, or word match on "text" indexed
+    fields), a list (match any), a dict with gt/gte/lt/lte (range) or a dict
+    with lat/lon/radius in meters (geo radius).
+    """
+    if isinstance(value, dict):
+        if "radius" in value:
+            return FieldCondition(key=key, geo_radius=GeoRadius(
+                center=GeoPoint(lat=value["lat"], lon=value["lon"]),
+                radius=value["radius"]
+            ))
+        return FieldCondition(key=key, range=Range(**value))
+    if isinstance(value, (list, tuple, set)):
+        return FieldCondition(key=key, match=MatchAny(any=list(value)))
+
+    indexes = Config.collection_settings(collection_name)["indexes"]
+    if indexes.get(key) == "text":
+        return FieldCondition(key=key, match=MatchText(text=str(value)))
+    return FieldCondition(key=key, match=MatchValue(value=value))
+
+
+def _build_filter(collection_name: str, filter: Optional[Dict]) -> Optional[Filter]:
+    """Convert a {field: value} dict into a Qdrant filter (None values are ignored)"""
+    if not filter:
+        return None
+
+    conditions = [
+        _field_condition(collection_name, k, v)
+        for k, v in filter.items()
+        if v is not None and v != ""
+    ]
+    return Filter(must=conditions) if conditions else None
+
+
+def _index_schema(index_type: str):
+    """Qdrant payload schema for an index type name from Config"""
+    if index_type == "text":
+        return TextIndexParams(
+            type=TextIndexType.TEXT,
+            tokenizer=TokenizerType.WORD,
+            lowercase=True
+        )
+    return PayloadSchemaType(index_type)
+
+
+def _configured_search_dimensions(settings: Dict) -> Optional[int]:
+    """
+    First-pass vector size for a collection's settings, or None for a single full vector.
+
+    Reduced-dimension search needs Matryoshka embeddings and a size below
+    the embedding size.
+    """
+    size = settings["search_dimensions"]
+    if not size or not embedding_truncatable() or size >= get_embedding_dimensions():
+        return None
+    return size
+
+
+def _vectors_config(collection_name: str):
+    """Vector parameters for a new collection from its Config settings"""
+    settings = Config.collection_settings(collection_name)
+    full_size = get_embedding_dimensions()
+    search_dimensions = _configured_search_dimensions(settings)
+
+    if not search_dimensions:
+        return VectorParams(
+            size=full_size,
+            distance=Distance.COSINE,
+            on_disk=settings["on_disk"]
+        )
+
+    # Small vectors stay in RAM for the first pass; full vectors are only
+    # read from disk when rescoring candidates
+    return {
+        FAST_VECTOR: VectorParams(
+            size=search_dimensions,
+            distance=Distance.COSINE,
+            on_disk=settings["on_disk"]
+        ),
+        FULL_VECTOR: VectorParams(
+            size=full_size,
+            distance=Distance.COSINE,
+            on_disk=True
+        )
+    }
+
+
+def _hnsw_config(settings: Dict) -> Optional[HnswConfigDiff]:
+    """HNSW index parameters from a collection profile (None keeps server defaults)"""
+    if settings["hnsw_m"] is None and settings["hnsw_ef_construct"] is None:
+        return None
+    return HnswConfigDiff(m=settings["hnsw_m"], ef_construct=settings["hnsw_ef_construct"])
+
+
+def _quantization_config(settings: Dict):
+    """Quantization config from a collection profile (None if disabled)"""
+    quantization = settings["quantization"]
+    always_ram = settings["quantization_always_ram"]
+
+    if quantization is None:
+        return None
+    if quantization == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=always_ram)
+        )
+    if quantization == "product":
+        return ProductQuantization(
+            product=ProductQuantizationConfig(compression=CompressionRatio.X16, always_ram=always_ram)
+        )
+    if quantization == "binary":
+        return BinaryQuantization(
+            binary=BinaryQuantizationConfig(always_ram=always_ram)
+        )
+
+    raise ValueError(f"Unknown quantization: {quantization}")
+
+
+def _search_params(settings: Dict) -> Optional[SearchParams]:
+    """Search-time HNSW and quantization parameters from a collection profile"""
+    quantization = None
+    if settings["quantization"] is not None:
+        quantization = QuantizationSearchParams(
+            rescore=settings["quantization_rescore"],
+            oversampling=settings["oversampling"]
+        )
+
+    if settings["hnsw_ef"] is None and quantization is None:
+        return None
+    return SearchParams(hnsw_ef=settings["hnsw_ef"], quantization=quantization)
+
+
+# Bytes per dimension kept in RAM for quantized vectors
+_QUANTIZED_BYTES = {"scalar": 1.0, "product": 4.0 / 16, "binary": 1.0 / 8}
+
+
+def _estimate_vector_memory(settings: Dict, points: int) -> int:
+    """
+    Rough RAM needed for a collection's searchable vectors.
+
+    Counts in-RAM original vectors plus in-RAM quantized copies, with 50%
+    overhead for the HNSW graph and bookkeeping. Full vectors of
+    reduced-dimension collections live on disk and are not counted.
+    """
+    dimensions = _configured_search_dimensions(settings) or get_embedding_dimensions()
+    per_point = 0.0 if settings["on_disk"] else dimensions * 4.0
+    if settings["quantization"] and (settings["quantization_always_ram"] or not settings["on_disk"]):
+        per_point += dimensions * _QUANTIZED_BYTES[settings["quantization"]]
+    return int(points * per_point * 1.5)
+
+
+def _layout_search_dimensions(info) -> Optional[int]:
+    """First-pass vector size from collection info (None if single-vector)"""
+    vectors = info.config.params.vectors
+    if isinstance(vectors, dict) and FAST_VECTOR in vectors:
+        return vectors[FAST_VECTOR].size
+    return None
+
+
+def _point_vector(search_dimensions: Optional[int], embedding: List[float]):
+    """Vector(s) to store for an embedding, matching the collection layout"""
+    if search_dimensions is None:
+        return embedding
+    return {
+        FAST_VECTOR: _truncate_vector(embedding, search_dimensions),
+        FULL_VECTOR: embedding
+    }
+
+
+def _query_request(
+    collection_name: str,
+    search_dimensions: Optional[int],
+    query_vector: List[float],
+    limit: int,
+    score_threshold: Optional[float],
+    search_filter: Optional[Filter],
+    with_payload: Union[bool, List[str]] = True
+) -> QueryRequest:
+    """Query request for a collection, using truncated vectors + rescoring if configured"""
+    settings = Config.collection_settings(collection_name)
+    params = _search_params(settings)
+
+    if search_dimensions is None:
+        return QueryRequest(
+            query=query_vector,
+            filter=search_filter,
+            params=params,
+            limit=limit,
+            score_threshold=score_threshold,
+            with_payload=with_payload
+        )
+
+    fast_vector = _truncate_vector(query_vector, search_dimensions)
+    if not settings["rescore"]:
+        return QueryRequest(
+            query=fast_vector,
+            using=FAST_VECTOR,
+            filter=search_filter,
+            params=params,
+            limit=limit,
+            score_threshold=score_threshold,
+            with_payload=with_payload
+        )
+
+    # HNSW/quantization params apply to the first pass; rescoring is exact
+    return QueryRequest(
+        prefetch=Prefetch(
+            query=fast_vector,
+            using=FAST_VECTOR,
+            filter=search_filter,
+            params=params,
+            limit=limit * settings["prefetch_factor"]
+        ),
+        query=query_vector,
+        using=FULL_VECTOR,
+        filter=search_filter,
+        limit=limit,
+        score_threshold=score_threshold,
+        with_payload=with_payload
+    )
+
+
+def _project(points: List, with_payload: Union[bool, List[str]]) -> List:
+    """In-process results (keyword index, mirror) with only the requested payload fields"""
+    if with_payload is True:
+        return points
+    return [
+        ScoredPoint(
+            id=point.id,
+            version=point.version,
+            score=point.score,
+            payload={k: point.payload[k] for k in with_payload if k in point.payload} if with_payload else None
+        )
+        for point in points
+    ]
+
+
+# Namespace for point IDs derived from source keys
+_SYNC_NAMESPACE = uuid.UUID("6f1c3c1e-8a52-4c1b-9a8e-3d7f0f4b2a61")
+
+
+def _point_id(source_key: str) -> str:
+    """Deterministic point ID for a source record key"""
+    return str(uuid.uuid5(_SYNC_NAMESPACE, source_key))
+
+
+def _content_hash(text: str, metadata: Dict) -> str:
+    """Hash of everything that ends up in a point, used for change detection"""
+    raw = json.dumps({"text": text, "metadata": metadata}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most `size` items"""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _load_checkpoint(path: Optional[str], collection_name: str) -> int:
+    """Number of points already upserted according to a checkpoint file"""
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        state = json.load(f)
+    return state.get("done", 0) if state.get("collection") == collection_name else 0
+
+
+def _save_checkpoint(path: Optional[str], collection_name: str, done: int):
+    """Record ingestion progress"""
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"collection": collection_name, "done": done}, f)
+    os.replace(tmp_path, path)
+
+
+def _clear_checkpoint(path: Optional[str]):
+    """Remove a checkpoint once ingestion has completed"""
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+def _create_client(url: str) -> QdrantClient:
+    """Client with a keep-alive connection pool shared by all threads using it"""
+    return QdrantClient(
+        url=url,
+        api_key=Config.QDRANT_API_KEY,
+        prefer_grpc=Config.QDRANT_PREFER_GRPC,
+        grpc_port=Config.QDRANT_GRPC_PORT,
+        timeout=Config.QDRANT_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=Config.QDRANT_POOL_SIZE,
+            max_keepalive_connections=Config.QDRANT_POOL_SIZE,
+            keepalive_expiry=Config.QDRANT_KEEPALIVE_SECONDS
+        )
+    )
 
 
 class QdrantManager:
@@ -14,57 +361,274 @@ class QdrantManager:
 
     def __init__(self):
         Config.validate()
-        self.client = QdrantClient(
-            url=Config.QDRANT_URL,
-            api_key=Config.QDRANT_API_KEY
+        # Primary: all writes, scrolls and collection management
+        self.client = _create_client(Config.QDRANT_URL)
+        # Searches are spread over the primary and read replicas
+        self._router: Optional[ReplicaRouter] = None
+        if len(Config.QDRANT_URLS) > 1:
+            self._router = ReplicaRouter(
+                [(Config.QDRANT_URL, self.client)]
+                + [(url, _create_client(url)) for url in Config.QDRANT_URLS[1:]],
+                health_check_seconds=Config.QDRANT_HEALTH_CHECK_SECONDS,
+                failure_threshold=Config.QDRANT_FAILURE_THRESHOLD
+            )
+        # collection name -> first-pass vector size (None for single-vector collections)
+        self._layouts: Dict[str, Optional[int]] = {}
+        # In-process copies of small collections (Config.MIRROR_COLLECTIONS)
+        self._mirrors: Dict[str, CollectionMirror] = {
+            name: CollectionMirror(name) for name in Config.MIRROR_COLLECTIONS
+        }
+        # Exact name/location lookups for the configured collections
+        self._keyword_indexes: Dict[str, KeywordIndex] = (
+            {
+                name: KeywordIndex(name) for name in Config.COLLECTIONS
+                if Config.collection_settings(name)["keyword_index"]
+            }
+            if Config.KEYWORD_INDEX_ENABLED else {}
+        )
+        self._result_cache: Optional[SearchResultCache] = (
+            SearchResultCache(Config.SEARCH_CACHE_MAX_ENTRIES, Config.SEARCH_CACHE_TTL_SECONDS)
+            if Config.SEARCH_CACHE_ENABLED else None
         )
 
-    def create_collection(self, collection_name: str):
-        """Create a new collection if it doesn't exist"""
+        # Called with the collection name after every write through this manager
+        self._write_listeners: List[Callable[[str], None]] = []
+        if self._result_cache is not None:
+            self.add_write_listener(self._result_cache.invalidate)
+        for mirror in self._mirrors.values():
+            self.add_write_listener(
+                lambda name, mirror=mirror: name == mirror.collection_name and mirror.invalidate()
+            )
+
+    def add_write_listener(self, listener: Callable[[str], None]):
+        """Register a callback invoked with the collection name after each write"""
+        self._write_listeners.append(listener)
+
+    def _notify_write(self, collection_name: str):
+        """Invalidate state derived from a collection after it was written"""
+        for listener in self._write_listeners:
+            listener(collection_name)
+
+    def _read(self, call: Callable[[QdrantClient], object]):
+        """
+        Run a search request on a replica (or the primary if there are none).
+
+        Retried and hedged per the "qdrant_search" resilience policy; a hedged
+        duplicate may go to a different replica.
+        """
+        if self._router is None:
+            return get_policy("qdrant_search").call(call, self.client)
+        return get_policy("qdrant_search").call(self._router.read, call)
+
+    def replica_stats(self) -> List[Dict]:
+        """Per-node routing state (empty without replicas)"""
+        return self._router.stats() if self._router is not None else []
+
+    def search_cache_stats(self) -> Optional[Dict[str, float]]:
+        """Search result cache counters (None if the cache is disabled)"""
+        return self._result_cache.stats() if self._result_cache is not None else None
+
+    def _mirror(self, collection_name: str) -> Optional[CollectionMirror]:
+        """Up-to-date mirror for a collection, or None if it is not mirrored (or not loaded)"""
+        mirror = self._mirrors.get(collection_name)
+        if mirror is not None and mirror.refresh_if_due(self):
+            return mirror
+        return None
+
+    def build_keyword_indexes(self):
+        """Build the name/location indexes for all configured collections (e.g. at startup)"""
+        for index in self._keyword_indexes.values():
+            index.ensure_loaded(self)
+
+    def keyword_lookup(
+        self,
+        collection_name: str,
+        query_text: str,
+        limit: int = 5,
+        filter: Optional[Dict] = None
+    ) -> Optional[List]:
+        """
+        Exact name/location lookup without vector search.
+
+        Returns:
+            Matching points, or None if the query is not made only of indexed
+            names/locations (or the keyword index is disabled)
+        """
+        index = self._keyword_indexes.get(collection_name)
+        if index is None or not index.ensure_loaded(self):
+            return None
+        return index.search(query_text, limit, filter)
+
+    def _keyword_search(
+        self,
+        collection_name: str,
+        query_text: str,
+        limit: int,
+        filter: Optional[Dict],
+        with_payload: Union[bool, List[str]] = True
+    ) -> Optional[List]:
+        """Results for queries that only name indexed entities, or None to use vector search"""
+        results = self.keyword_lookup(collection_name, query_text, limit, filter)
+        return _project(results, with_payload) if results else None
+
+    def create_collection(self, collection_name: str, settings_from: Optional[str] = None):
+        """
+        Create a new collection if it doesn't exist.
+
+        Args:
+            collection_name: Name of the collection
+            settings_from: Take Config settings from another collection name
+                (used for temporary collections during migration)
+        """
         collections = self.client.get_collections().collections
         existing = [c.name for c in collections]
 
         if collection_name not in existing:
+            settings = Config.collection_settings(settings_from or collection_name)
             self.client.create_collection(
                 collection_name=collection_name,
-                vectors_config=VectorParams(
-                    size=Config.EMBEDDING_DIMENSIONS,
-                    distance=Distance.COSINE
-                )
+                vectors_config=_vectors_config(settings_from or collection_name),
+                hnsw_config=_hnsw_config(settings),
+                quantization_config=_quantization_config(settings),
+                on_disk_payload=settings["on_disk_payload"]
             )
+            self._layouts.pop(collection_name, None)
             print(f"Created collection: {collection_name}")
         else:
             print(f"Collection already exists: {collection_name}")
 
-    def add_points(self, collection_name: str, points: List[Dict]):
+        self.create_payload_indexes(collection_name, settings_from)
+
+    def create_payload_indexes(self, collection_name: str, settings_from: Optional[str] = None):
+        """Create the payload indexes configured for a collection that don't exist yet"""
+        indexes = Config.collection_settings(settings_from or collection_name)["indexes"]
+        existing = self.client.get_collection(collection_name).payload_schema
+
+        for field, index_type in indexes.items():
+            if field not in existing:
+                self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field,
+                    field_schema=_index_schema(index_type)
+                )
+                print(f"Created {index_type} index on {collection_name}.{field}")
+
+    def apply_profile(self, collection_name: str):
+        """
+        Apply the HNSW, quantization and on-disk settings from Config.COLLECTIONS
+        to an existing collection.
+
+        Qdrant rebuilds indexes in the background. Changing `search_dimensions`
+        needs `migrate_collection` instead.
+        """
+        settings = Config.collection_settings(collection_name)
+        vector_name = FAST_VECTOR if self._search_dimensions(collection_name) else ""
+
+        self.client.update_collection(
+            collection_name=collection_name,
+            vectors_config={vector_name: VectorParamsDiff(on_disk=settings["on_disk"])},
+            hnsw_config=_hnsw_config(settings),
+            quantization_config=_quantization_config(settings) or Disabled.DISABLED,
+            collection_params=CollectionParamsDiff(on_disk_payload=settings["on_disk_payload"])
+        )
+        print(f"Applied profile to collection: {collection_name}")
+
+    def estimate_memory(self, collection_name: str) -> Dict:
+        """Point count and estimated vector RAM for a collection under its profile"""
+        settings = Config.collection_settings(collection_name)
+        points = self.client.count(collection_name=collection_name, exact=True).count
+        return {
+            "points": points,
+            "vector_ram_bytes": _estimate_vector_memory(settings, points)
+        }
+
+    def _search_dimensions(self, collection_name: str) -> Optional[int]:
+        """First-pass vector size of an existing collection (None if single-vector)"""
+        if collection_name not in self._layouts:
+            info = self.client.get_collection(collection_name)
+            self._layouts[collection_name] = _layout_search_dimensions(info)
+        return self._layouts[collection_name]
+
+    def add_points(
+        self,
+        collection_name: str,
+        points: List[Dict],
+        max_workers: Optional[int] = None,
+        checkpoint_path: Optional[str] = None
+    ) -> int:
         """
         Add points to a collection.
 
+        Texts are embedded in token-budgeted batches on a bounded worker pool
+        and upserted in chunks as batches complete. At most `2 * max_workers`
+        batches are in flight, so memory stays bounded for large loads. With a
+        checkpoint file, an interrupted load resumes after the last upserted
+        chunk (the same `points` must be passed again, in the same order).
+
         Args:
             collection_name: Name of the collection
             points: List of dicts with 'id', 'text', and optional 'metadata'
+            max_workers: Concurrent embedding requests (default: Config.INGEST_MAX_WORKERS)
+            checkpoint_path: Optional JSON file used to record progress
+
+        Returns:
+            Number of points upserted by this call
         """
-        vectors = []
-        for point in points:
-            text = point.get("text", "")
-            embedding = get_embedding(text)
-            vectors.append({
-                "id": point["id"],
-                "vector": embedding,
-                "payload": {**point.get("metadata", {}), "text": text}
-            })
+        max_workers = max_workers or Config.INGEST_MAX_WORKERS
+        done = _load_checkpoint(checkpoint_path, collection_name)
+        remaining = points[done:]
+        if done:
+            print(f"Resuming {collection_name} ingestion at point {done}/{len(points)}")
 
-        # Convert to PointStruct
-        points_struct = [
-            PointStruct(
-                id=v["id"],
-                vector=v["vector"],
-                payload=v["payload"]
-            )
-            for v in vectors
-        ]
+        texts = [point.get("text", "") for point in remaining]
+        search_dimensions = self._search_dimensions(collection_name)
+        batches = iter(batch_texts(texts))
+        in_flight = deque()
+        buffer = []
+        upserted = 0
 
-        self.client.upsert(collection_name=collection_name, points=points_struct)
+        def flush(size: int):
+            nonlocal buffer, done, upserted
+            while len(buffer) >= size and buffer:
+                chunk, buffer = buffer[:Config.UPSERT_CHUNK_SIZE], buffer[Config.UPSERT_CHUNK_SIZE:]
+                get_policy("qdrant_write").call(
+                    self.client.upsert, collection_name=collection_name, points=chunk
+                )
+                if collection_name in self._keyword_indexes:
+                    self._keyword_indexes[collection_name].add(chunk)
+                done += len(chunk)
+                upserted += len(chunk)
+                _save_checkpoint(checkpoint_path, collection_name, done)
+                print(f"Upserted {done}/{len(points)} points into {collection_name}")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            def submit_next() -> bool:
+                batch = next(batches, None)
+                if batch is None:
+                    return False
+                start, end = batch
+                in_flight.append((start, end, executor.submit(get_embeddings, texts[start:end], bulk=True)))
+                return True
+
+            while len(in_flight) < max_workers * 2 and submit_next():
+                pass
+
+            # Consume batches in submission order so the checkpoint is a prefix
+            while in_flight:
+                start, end, future = in_flight.popleft()
+                for point, text, embedding in zip(remaining[start:end], texts[start:end], future.result()):
+                    buffer.append(PointStruct(
+                        id=point["id"],
+                        vector=_point_vector(search_dimensions, embedding),
+                        payload={**point.get("metadata", {}), "text": text}
+                    ))
+                flush(Config.UPSERT_CHUNK_SIZE)
+                submit_next()
+
+        flush(1)
+        _clear_checkpoint(checkpoint_path)
+        self._notify_write(collection_name)
+        return upserted
 
     def search(
         self,
@@ -72,68 +636,535 @@ class QdrantManager:
         query_text: str,
         limit: int = 5,
         score_threshold: float = 0.5,
-        filter: Optional[Dict] = None
+        filter: Optional[Dict] = None,
+        with_payload: Union[bool, List[str]] = True
     ) -> List:
         """
         Search a collection by query text.
 
+        Results are cached per collection (see Config.SEARCH_CACHE_*) until
+        they expire or the collection is written. Queries made only of known
+        names/locations and filler words are answered from the keyword index
+        with score 1.0. Mirrored collections
+        (Config.MIRROR_COLLECTIONS) are searched in process with exact cosine
+        similarity instead of calling Qdrant.
+
         Args:
             collection_name: Name of the collection
             query_text: Search query
             limit: Max results
             score_threshold: Minimum similarity score
             filter: Optional metadata filter
+            with_payload: True, False or a list of payload fields to return
+                (other fields are not fetched from Qdrant)
 
         Returns:
             List of search results
         """
-        query_vector = get_embedding(query_text)
+        cache_key = search_cache_key(collection_name, query_text, limit, score_threshold, filter, with_payload)
+        if self._result_cache is not None:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        results = self._keyword_search(collection_name, query_text, limit, filter, with_payload)
+        if results is None:
+            query_vector = get_embedding(query_text)
+            mirror = self._mirror(collection_name)
+            if mirror is not None:
+                results = _project(mirror.search(query_vector, limit, score_threshold, filter), with_payload)
+            else:
+                request = _query_request(
+                    collection_name, self._search_dimensions(collection_name),
+                    query_vector, limit, score_threshold, _build_filter(collection_name, filter),
+                    with_payload
+                )
+                results = self._read(lambda client: client.query_batch_points(
+                    collection_name=collection_name,
+                    requests=[request]
+                ))[0].points
+
+        if self._result_cache is not None:
+            self._result_cache.put(cache_key, results)
+        return results
+
+    def search_many(self, searches: List[Dict]) -> List[List]:
+        """
+        Run several searches with one embedding request and one batch query per collection.
+
+        Args:
+            searches: List of dicts with 'collection_name', 'query_text' and
+                optional 'limit', 'score_threshold', 'filter' and
+                'with_payload' (same defaults as `search`)
+
+        Returns:
+            List of search results per search, in input order
+        """
+        if not searches:
+            return []
 
-        search_filter = None
-        if filter:
-            conditions = [
-                FieldCondition(key=k, match=MatchValue(value=v))
-                for k, v in filter.items()
+        results: List[List] = [[] for _ in searches]
+        keys = [
+            search_cache_key(
+                item["collection_name"], item["query_text"], item.get("limit", 5),
+                item.get("score_threshold", 0.5), item.get("filter"), item.get("with_payload", True)
+            )
+            for item in searches
+        ]
+        uncached = []
+        for i, key in enumerate(keys):
+            cached = self._result_cache.get(key) if self._result_cache is not None else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                uncached.append(i)
+
+        pending = []
+        for i in uncached:
+            item = searches[i]
+            hits = self._keyword_search(
+                item["collection_name"], item["query_text"], item.get("limit", 5), item.get("filter"),
+                item.get("with_payload", True)
+            )
+            if hits is not None:
+                results[i] = hits
+            else:
+                pending.append(i)
+
+        texts = list(dict.fromkeys(searches[i]["query_text"] for i in pending))
+        vectors = dict(zip(texts, get_embeddings(texts))) if texts else {}
+
+        by_collection: Dict[str, List[int]] = {}
+        for i in pending:
+            item = searches[i]
+            mirror = self._mirror(item["collection_name"])
+            if mirror is not None:
+                results[i] = _project(
+                    mirror.search(
+                        vectors[item["query_text"]],
+                        item.get("limit", 5),
+                        item.get("score_threshold", 0.5),
+                        item.get("filter")
+                    ),
+                    item.get("with_payload", True)
+                )
+            else:
+                by_collection.setdefault(item["collection_name"], []).append(i)
+
+        def run_batch(collection_name: str, indices: List[int]) -> List:
+            search_dimensions = self._search_dimensions(collection_name)
+            requests = [
+                _query_request(
+                    collection_name, search_dimensions,
+                    vectors[searches[i]["query_text"]],
+                    searches[i].get("limit", 5),
+                    searches[i].get("score_threshold", 0.5),
+                    _build_filter(collection_name, searches[i].get("filter")),
+                    searches[i].get("with_payload", True)
+                )
+                for i in indices
             ]
-            search_filter = Filter(must=conditions)
+            return self._read(lambda client: client.query_batch_points(
+                collection_name=collection_name,
+                requests=requests
+            ))
 
-        results = self.client.search(
-            collection_name=collection_name,
-            query_vector=query_vector,
-            limit=limit,
-            score_threshold=score_threshold,
-            query_filter=search_filter
-        )
+        if by_collection:
+            with ThreadPoolExecutor(max_workers=len(by_collection)) as executor:
+                futures = {
+                    collection_name: executor.submit(run_batch, collection_name, indices)
+                    for collection_name, indices in by_collection.items()
+                }
+                for collection_name, indices in by_collection.items():
+                    for i, response in zip(indices, futures[collection_name].result()):
+                        results[i] = response.points
 
+        if self._result_cache is not None:
+            for i in uncached:
+                self._result_cache.put(keys[i], results[i])
         return results
 
-    def get_all_points(self, collection_name: str) -> List[Dict]:
-        """Get all points from a collection"""
-        results = self.client.scroll(
-            collection_name=collection_name,
-            limit=1000,
-            with_payload=True
-        )
+    def sync_points(
+        self,
+        collection_name: str,
+        records: List[Dict],
+        prune_unmanaged: bool = False
+    ) -> Dict[str, int]:
+        """
+        Incrementally sync a collection with a full snapshot of its source records.
 
-        points = []
-        for point in results[0]:
-            points.append({
-                "id": point.id,
-                "payload": point.payload
+        Point IDs are derived from each record's source key and a content hash
+        is stored in the payload, so only new or changed records are
+        re-embedded. Synced points whose key is missing from `records` are
+        deleted.
+
+        Args:
+            collection_name: Name of the collection
+            records: List of dicts with 'key', 'text', and optional 'metadata'
+            prune_unmanaged: Also delete points that were not created by a sync
+                (e.g. loaded earlier with add_points)
+
+        Returns:
+            Counts of added, changed, unchanged and deleted points
+        """
+        incoming = {}
+        for record in records:
+            key = str(record["key"])
+            if key in incoming:
+                raise ValueError(f"Duplicate source key in {collection_name}: {key}")
+            incoming[key] = record
+
+        existing = {}
+        unmanaged = []
+        for point in self.iter_points(collection_name, with_payload=["source_key", "content_hash"]):
+            if point.payload.get("source_key") is None:
+                unmanaged.append(point.id)
+            else:
+                existing[point.payload["source_key"]] = (point.id, point.payload.get("content_hash"))
+
+        counts = {"added": 0, "changed": 0, "unchanged": 0, "deleted": 0}
+        to_upsert = []
+        for key, record in incoming.items():
+            metadata = record.get("metadata", {})
+            content_hash = _content_hash(record.get("text", ""), metadata)
+            if key not in existing:
+                counts["added"] += 1
+            elif existing[key][1] != content_hash:
+                counts["changed"] += 1
+            else:
+                counts["unchanged"] += 1
+                continue
+
+            to_upsert.append({
+                "id": _point_id(key),
+                "text": record.get("text", ""),
+                "metadata": {**metadata, "source_key": key, "content_hash": content_hash}
             })
 
-        return points
+        if to_upsert:
+            self.add_points(collection_name, to_upsert)
+
+        stale = [point_id for key, (point_id, _) in existing.items() if key not in incoming]
+        if prune_unmanaged:
+            stale.extend(unmanaged)
+        for chunk in _chunked(stale, Config.UPSERT_CHUNK_SIZE):
+            get_policy("qdrant_write").call(
+                self.client.delete,
+                collection_name=collection_name,
+                points_selector=PointIdsList(points=chunk)
+            )
+        counts["deleted"] = len(stale)
+        if stale:
+            if collection_name in self._keyword_indexes:
+                self._keyword_indexes[collection_name].remove(stale)
+            self._notify_write(collection_name)
+
+        print(
+            f"Synced {collection_name}: {counts['added']} added, {counts['changed']} changed, "
+            f"{counts['unchanged']} unchanged, {counts['deleted']} deleted"
+        )
+        return counts
+
+    def export_collection(self, collection_name: str, directory: str) -> int:
+        """
+        Export a collection's full vectors and payloads to `directory/<collection>/`.
+
+        Files:
+            manifest.json        collection name, point count, vector size, embedding backend
+            vectors.npy          float32 matrix (points x dimensions) of full-size vectors
+            ids.npy              point IDs (int64, or fixed-width strings for UUIDs)
+            payloads.bin         UTF-8 JSON payloads, one after another
+            payload_offsets.npy  int64 byte offsets into payloads.bin (points + 1)
+
+        All .npy files can be opened with np.load(..., mmap_mode="r").
+
+        Returns:
+            Number of points exported
+        """
+        target = os.path.join(directory, collection_name)
+        os.makedirs(target, exist_ok=True)
+
+        count = self.client.count(collection_name=collection_name, exact=True).count
+        dimensions = get_embedding_dimensions()
+        vectors = np.lib.format.open_memmap(
+            os.path.join(target, "vectors.npy"), mode="w+", dtype=np.float32, shape=(count, dimensions)
+        )
+
+        ids = []
+        offsets = [0]
+        exported = 0
+        with open(os.path.join(target, "payloads.bin"), "wb") as payload_file:
+            for record in self.iter_points(collection_name, with_vectors=True):
+                if exported == count:
+                    break  # points added during the export are skipped
+                vectors[exported] = _full_vector(record.vector)
+                ids.append(record.id)
+                data = json.dumps(record.payload, separators=(",", ":")).encode("utf-8")
+                payload_file.write(data)
+                offsets.append(offsets[-1] + len(data))
+                exported += 1
+
+        vectors.flush()
+        del vectors
+        if exported < count:
+            # Points deleted during the export: shrink the matrix to what was written
+            np.save(os.path.join(target, "vectors.npy"), np.load(os.path.join(target, "vectors.npy"))[:exported])
+
+        id_array = (
+            np.array(ids, dtype=np.int64) if all(isinstance(i, int) for i in ids)
+            else np.array([str(i) for i in ids])
+        )
+        np.save(os.path.join(target, "ids.npy"), id_array)
+        np.save(os.path.join(target, "payload_offsets.npy"), np.array(offsets, dtype=np.int64))
+
+        with open(os.path.join(target, "manifest.json"), "w") as f:
+            json.dump({
+                "collection": collection_name,
+                "points": exported,
+                "dimensions": dimensions,
+                "embedding": embedding_provider_name()
+            }, f, indent=2)
+
+        print(f"Exported {exported} points from {collection_name} to {target}")
+        return exported
+
+    def import_collection(
+        self,
+        directory: str,
+        collection_name: str,
+        target_name: Optional[str] = None
+    ) -> int:
+        """
+        Import a collection exported with `export_collection` using bulk upserts.
+
+        The collection is created with its current Config layout if missing;
+        no texts are re-embedded.
+
+        Args:
+            directory: Export directory (containing `<collection_name>/`)
+            collection_name: Exported collection to load
+            target_name: Collection to import into (default: same name)
+
+        Returns:
+            Number of points imported
+        """
+        source = os.path.join(directory, collection_name)
+        target_name = target_name or collection_name
+
+        with open(os.path.join(source, "manifest.json")) as f:
+            manifest = json.load(f)
+        if manifest["dimensions"] != get_embedding_dimensions():
+            raise ValueError(
+                f"Snapshot has {manifest['dimensions']}-dimension vectors but the embedding "
+                f"backend produces {get_embedding_dimensions()}"
+            )
+        if manifest["embedding"] != embedding_provider_name():
+            print(f"Warning: snapshot was embedded with {manifest['embedding']}")
+
+        vectors = np.load(os.path.join(source, "vectors.npy"), mmap_mode="r")
+        ids = np.load(os.path.join(source, "ids.npy"), mmap_mode="r")
+        offsets = np.load(os.path.join(source, "payload_offsets.npy"), mmap_mode="r")
+        payloads = np.memmap(os.path.join(source, "payloads.bin"), dtype=np.uint8, mode="r") \
+            if offsets[-1] else np.zeros(0, dtype=np.uint8)
+
+        self.create_collection(target_name)
+        search_dimensions = self._search_dimensions(target_name)
+
+        for start in range(0, len(ids), Config.UPSERT_CHUNK_SIZE):
+            end = min(start + Config.UPSERT_CHUNK_SIZE, len(ids))
+            get_policy("qdrant_write").call(
+                self.client.upsert,
+                collection_name=target_name,
+                points=[
+                    PointStruct(
+                        id=ids[i].item(),
+                        vector=_point_vector(search_dimensions, vectors[i].tolist()),
+                        payload=json.loads(payloads[offsets[i]:offsets[i + 1]].tobytes())
+                    )
+                    for i in range(start, end)
+                ]
+            )
+
+        if target_name in self._keyword_indexes:
+            self._keyword_indexes[target_name].invalidate()
+        self._notify_write(target_name)
+        print(f"Imported {len(ids)} points into {target_name}")
+        return len(ids)
+
+    def iter_points(
+        self,
+        collection_name: str,
+        page_size: Optional[int] = None,
+        with_payload: Union[bool, List[str]] = True,
+        with_vectors: Union[bool, List[str]] = False,
+        filter: Optional[Dict] = None
+    ) -> Iterator[Record]:
+        """
+        Lazily iterate over every point in a collection, one scroll page at a time.
+
+        Args:
+            collection_name: Name of the collection
+            page_size: Points fetched per request (default: Config.SCROLL_PAGE_SIZE)
+            with_payload: True, False or a list of payload fields to fetch
+            with_vectors: True, False or a list of named vectors to fetch
+            filter: Optional metadata filter (same format as `search`)
+
+        Yields:
+            Qdrant records with id, payload and vector
+        """
+        scroll_filter = _build_filter(collection_name, filter)
+        offset = None
+        while True:
+            records, offset = get_policy("qdrant_scroll").call(
+                self.client.scroll,
+                collection_name=collection_name,
+                scroll_filter=scroll_filter,
+                limit=page_size or Config.SCROLL_PAGE_SIZE,
+                offset=offset,
+                with_payload=with_payload,
+                with_vectors=with_vectors
+            )
+            yield from records
+            if offset is None:
+                return
+
+    def get_all_points(self, collection_name: str) -> List[Dict]:
+        """Get all points from a collection (loads them all; prefer iter_points for large collections)"""
+        return [
+            {"id": point.id, "payload": point.payload}
+            for point in self.iter_points(collection_name)
+        ]
+
+    def delete_points(self, collection_name: str, filter: Dict):
+        """Delete every point matching a metadata filter (same format as `search`)"""
+        points_filter = _build_filter(collection_name, filter)
+        if points_filter is None:
+            raise ValueError("delete_points needs a non-empty filter")
+
+        get_policy("qdrant_write").call(
+            self.client.delete,
+            collection_name=collection_name,
+            points_selector=FilterSelector(filter=points_filter)
+        )
+        if collection_name in self._keyword_indexes:
+            self._keyword_indexes[collection_name].invalidate()
+        self._notify_write(collection_name)
 
     def delete_collection(self, collection_name: str):
         """Delete a collection"""
         self.client.delete_collection(collection_name=collection_name)
+        self._layouts.pop(collection_name, None)
+        if collection_name in self._keyword_indexes:
+            self._keyword_indexes[collection_name].clear()
+        self._notify_write(collection_name)
         print(f"Deleted collection: {collection_name}")
 
     def init_collections(self):
         """Initialize all required collections"""
-        for name, description in Config.COLLECTIONS.items():
+        for name in Config.COLLECTIONS:
             self.create_collection(name)
 
+    def migrate_collection(self, collection_name: str):
+        """
+        Rebuild a collection with the vector layout configured in Config.COLLECTIONS.
+
+        Stored full-size vectors are reused (truncated where needed), so no
+        texts are re-embedded. Points are staged in a temporary collection
+        first, so the data survives an interruption between the two copies;
+        a re-run after such an interruption resumes from the staged copy.
+
+        Raises:
+            RuntimeError: A copy did not contain every point (the source is kept)
+        """
+        temp_name = f"{collection_name}__migration"
+        source_count = self._point_count(collection_name)
+
+        if self.client.collection_exists(temp_name):
+            staged = self._point_count(temp_name)
+            if source_count < staged:
+                # Interrupted after the source was dropped (it is missing or
+                # partly refilled): the staged copy is the only complete one
+                print(f"Resuming migration of {collection_name} from {temp_name}")
+                self._restore_from_staging(collection_name, temp_name, staged)
+                return
+            # Interrupted while staging: the source is intact
+            self.delete_collection(temp_name)
+
+        self.create_collection(temp_name, settings_from=collection_name)
+        copied = self._copy_points(collection_name, temp_name)
+        staged = self._point_count(temp_name)
+        if copied != source_count or staged != source_count:
+            raise RuntimeError(
+                f"Staging {collection_name} copied {copied} points ({staged} stored), "
+                f"expected {source_count}; {collection_name} was left unchanged"
+            )
+
+        self._restore_from_staging(collection_name, temp_name, staged)
+        print(f"Migrated {copied} points in {collection_name}")
+
+    def _point_count(self, collection_name: str) -> int:
+        """Exact number of points in a collection (0 if it doesn't exist)"""
+        if not self.client.collection_exists(collection_name):
+            return 0
+        return self.client.count(collection_name=collection_name, exact=True).count
+
+    def _restore_from_staging(self, collection_name: str, temp_name: str, expected: int):
+        """Recreate a collection from its staged copy, then drop the copy once verified"""
+        if self.client.collection_exists(collection_name):
+            self.delete_collection(collection_name)
+        self.create_collection(collection_name)
+        self._copy_points(temp_name, collection_name)
+        restored = self._point_count(collection_name)
+        if restored != expected:
+            raise RuntimeError(
+                f"Restored {restored} of {expected} points into {collection_name}; "
+                f"the staged copy {temp_name} was kept, re-run the migration to resume"
+            )
+        self.delete_collection(temp_name)
+
+    def _copy_points(self, source: str, target: str) -> int:
+        """Copy points between collections, converting vectors to the target layout"""
+        search_dimensions = self._search_dimensions(target)
+        copied = 0
+        records = self.iter_points(source, page_size=Config.UPSERT_CHUNK_SIZE, with_vectors=True)
+        for chunk in _chunked(records, Config.UPSERT_CHUNK_SIZE):
+            get_policy("qdrant_write").call(
+                self.client.upsert,
+                collection_name=target,
+                points=[
+                    PointStruct(
+                        id=record.id,
+                        vector=_point_vector(search_dimensions, _full_vector(record.vector)),
+                        payload=record.payload
+                    )
+                    for record in chunk
+                ]
+            )
+            copied += len(chunk)
+        if target in self._keyword_indexes:
+            self._keyword_indexes[target].invalidate()
+        self._notify_write(target)
+        return copied
+
+
+_shared_manager: Optional[QdrantManager] = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_qdrant_manager() -> QdrantManager:
+    """
+    Process-wide QdrantManager shared by the agent and all tools.
+
+    Created on first use; the underlying client is thread-safe and reuses
+    pooled keep-alive connections across calls.
+    """
+    global _shared_manager
+    if _shared_manager is None:
+        with _shared_manager_lock:
+            if _shared_manager is None:
+                _shared_manager = QdrantManager()
+    return _shared_manager
+
 
 # Initialize collections on module import
 def init_database():
@@ -141,3 +1172,80 @@ def init_database():
     manager = QdrantManager()
     manager.init_collections()
     return manager
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the Qdrant collections")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("init", help="Create all configured collections")
+
+    migrate_parser = commands.add_parser(
+        "migrate", help="Rebuild collections with their configured vector layout"
+    )
+    migrate_parser.add_argument(
+        "collections", nargs="*", help="Collections to migrate (default: all configured)"
+    )
+
+    profile_parser = commands.add_parser(
+        "apply-profiles", help="Apply HNSW, quantization and on-disk settings to existing collections"
+    )
+    profile_parser.add_argument(
+        "collections", nargs="*", help="Collections to update (default: all configured)"
+    )
+
+    commands.add_parser("memory", help="Estimate vector RAM per collection")
+
+    for name, help_text in (
+        ("export", "Export collections to local .npy/payload files"),
+        ("import", "Import collections from an export directory")
+    ):
+        snapshot_parser = commands.add_parser(name, help=help_text)
+        snapshot_parser.add_argument("directory", help="Export directory")
+        snapshot_parser.add_argument(
+            "collections", nargs="*", help="Collections (default: all configured)"
+        )
+
+    sync_parser = commands.add_parser(
+        "sync", help="Incrementally sync a collection from a JSON Lines file of source records"
+    )
+    sync_parser.add_argument("collection", help="Collection to sync")
+    sync_parser.add_argument(
+        "path", help="JSON Lines file, one {\"key\", \"text\", \"metadata\"} record per line"
+    )
+    sync_parser.add_argument(
+        "--prune-unmanaged", action="store_true",
+        help="Also delete points not created by sync"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "init":
+        init_database()
+    elif args.command == "migrate":
+        manager = QdrantManager()
+        for name in args.collections or list(Config.COLLECTIONS):
+            manager.migrate_collection(name)
+    elif args.command == "apply-profiles":
+        manager = QdrantManager()
+        for name in args.collections or list(Config.COLLECTIONS):
+            manager.apply_profile(name)
+    elif args.command == "memory":
+        manager = QdrantManager()
+        for name in Config.COLLECTIONS:
+            estimate = manager.estimate_memory(name)
+            print(f"{name}: {estimate['points']} points, ~{estimate['vector_ram_bytes'] / 2**20:.1f} MiB vector RAM")
+    elif args.command == "export":
+        manager = QdrantManager()
+        for name in args.collections or list(Config.COLLECTIONS):
+            manager.export_collection(name, args.directory)
+    elif args.command == "import":
+        manager = QdrantManager()
+        for name in args.collections or list(Config.COLLECTIONS):
+            manager.import_collection(args.directory, name)
+    elif args.command == "sync":
+        with open(args.path) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        QdrantManager().sync_points(args.collection, records, prune_unmanaged=args.prune_unmanaged)
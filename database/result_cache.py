@@ -0,0 +1,105 @@
+"""
+Search result cache: size-bounded LRU with per-collection TTLs
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+from utils.config import Config
+
+
+def search_cache_key(
+    collection_name: str,
+    query_text: str,
+    limit: int,
+    score_threshold: Optional[float],
+    filter: Optional[Dict],
+    with_payload: Union[bool, List[str]] = True
+) -> Tuple:
+    """Cache key for a search (query is case- and whitespace-normalized; None filter values are dropped)"""
+    active_filter = {
+        k: v for k, v in (filter or {}).items() if v is not None and v != ""
+    }
+    return (
+        collection_name,
+        " ".join(query_text.split()).casefold(),
+        limit,
+        score_threshold,
+        json.dumps(active_filter, sort_keys=True, default=str),
+        tuple(sorted(with_payload)) if isinstance(with_payload, (list, tuple)) else bool(with_payload)
+    )
+
+
+class SearchResultCache:
+    """
+    LRU cache of search results.
+
+    Entries expire after the collection's `cache_ttl` (Config.COLLECTIONS) or
+    Config.SEARCH_CACHE_TTL_SECONDS, and are dropped when the collection is
+    written through QdrantManager.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        # key -> (expires_at, results)
+        self._entries: "OrderedDict[Tuple, Tuple[float, List]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    def ttl(self, collection_name: str) -> float:
+        """Time to live for a collection's results, in seconds"""
+        ttl = Config.collection_settings(collection_name)["cache_ttl"]
+        return self.default_ttl if ttl is None else ttl
+
+    def get(self, key: Tuple) -> Optional[List]:
+        """Cached results for a key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self._stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return list(entry[1])
+
+    def put(self, key: Tuple, results: List):
+        """Store results for a key (key[0] is the collection name)"""
+        ttl = self.ttl(key[0])
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, list(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, collection_name: str):
+        """Drop every cached result for a collection"""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == collection_name]
+            for key in stale:
+                del self._entries[key]
+            self._stats["invalidations"] += len(stale)
+
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss, expiry, eviction and invalidation counters plus current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,165 @@
+"""
+Read routing across a Qdrant primary and its replicas
+
+Reads go to a healthy node chosen with probability inversely proportional to
+its recent latency (exponentially weighted moving average). Nodes that fail
+repeatedly are taken out of rotation and re-admitted once a background health
+check succeeds again.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from utils.resilience import is_retryable
+
+T = TypeVar("T")
+
+
+class _Node:
+    """One Qdrant endpoint and its routing state"""
+
+    def __init__(self, url: str, client):
+        self.url = url
+        self.client = client
+        self.healthy = True
+        self.latency: Optional[float] = None  # EWMA of request latency in seconds
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.failures = 0
+
+
+class ReplicaRouter:
+    """
+    Latency-weighted, health-aware selection of a node for read requests.
+
+    Args:
+        nodes: (url, client) pairs; the first one is the primary
+        health_check_seconds: Interval between background health checks
+            (0 disables the checker thread)
+        failure_threshold: Consecutive failures before a node is removed
+        ewma_alpha: Weight of the newest latency sample
+    """
+
+    def __init__(
+        self,
+        nodes: List[Tuple[str, object]],
+        health_check_seconds: float = 10,
+        failure_threshold: int = 3,
+        ewma_alpha: float = 0.3
+    ):
+        self.nodes = [_Node(url, client) for url, client in nodes]
+        self.failure_threshold = failure_threshold
+        self.ewma_alpha = ewma_alpha
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        if health_check_seconds > 0 and len(self.nodes) > 1:
+            threading.Thread(
+                target=self._health_loop, args=(health_check_seconds,), daemon=True
+            ).start()
+
+    def close(self):
+        """Stop the health checker"""
+        self._stop.set()
+
+    def read(self, call: Callable[[object], T]) -> T:
+        """
+        Run a read request on the best available node, failing over to the others.
+
+        Only transient errors (transport, timeouts, 5xx, 408/429) count against
+        a node and fail over; client errors such as a bad filter or a missing
+        collection are raised right away.
+
+        Args:
+            call: Function taking a QdrantClient and performing the request
+
+        Returns:
+            The result of `call`
+        """
+        tried = set()
+        last_error = None
+        while len(tried) < len(self.nodes):
+            node = self._pick(exclude=tried)
+            tried.add(node.url)
+            start = time.perf_counter()
+            try:
+                result = call(node.client)
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                self._record(node, None)
+                last_error = e
+                continue
+            self._record(node, time.perf_counter() - start)
+            return result
+        raise last_error
+
+    def stats(self) -> List[Dict]:
+        """Routing state per node"""
+        with self._lock:
+            return [
+                {
+                    "url": node.url,
+                    "primary": i == 0,
+                    "healthy": node.healthy,
+                    "latency_ms": node.latency * 1000 if node.latency is not None else None,
+                    "requests": node.requests,
+                    "failures": node.failures,
+                }
+                for i, node in enumerate(self.nodes)
+            ]
+
+    def _pick(self, exclude: set) -> _Node:
+        """Weighted random choice among healthy nodes (any remaining node if none are healthy)"""
+        with self._lock:
+            candidates = [n for n in self.nodes if n.url not in exclude and n.healthy]
+            if not candidates:
+                # Everything looks down: still try the rest, primary first
+                return next(n for n in self.nodes if n.url not in exclude)
+
+            # Nodes without samples yet get the best known latency so they are tried
+            known = [n.latency for n in candidates if n.latency is not None]
+            default = min(known) if known else 1.0
+            weights = [1.0 / max(n.latency if n.latency is not None else default, 1e-4) for n in candidates]
+            return random.choices(candidates, weights=weights)[0]
+
+    def _record(self, node: _Node, latency: Optional[float]):
+        """Update a node's latency average or failure count (latency None = failed)"""
+        with self._lock:
+            node.requests += 1
+            if latency is None:
+                node.failures += 1
+                node.consecutive_failures += 1
+                if node.healthy and node.consecutive_failures >= self.failure_threshold:
+                    node.healthy = False
+                    print(f"Qdrant node removed from rotation: {node.url}")
+                return
+
+            node.consecutive_failures = 0
+            node.latency = (
+                latency if node.latency is None
+                else self.ewma_alpha * latency + (1 - self.ewma_alpha) * node.latency
+            )
+
+    def check_health(self):
+        """Probe every node once; re-admit recovered nodes and remove failing ones"""
+        for node in self.nodes:
+            start = time.perf_counter()
+            try:
+                node.client.get_collections()
+            except Exception:
+                self._record(node, None)
+                continue
+
+            self._record(node, time.perf_counter() - start)
+            with self._lock:
+                if not node.healthy:
+                    node.healthy = True
+                    print(f"Qdrant node re-admitted: {node.url}")
+
+    def _health_loop(self, interval: float):
+        """Background health checks until `close` is called"""
+        while not self._stop.wait(interval):
+            self.check_health()
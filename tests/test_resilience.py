@@ -0,0 +1,54 @@
+"""
+Tests for the circuit breaker in utils/resilience.py
+"""
+
+import os
+
+os.environ.setdefault("EMBEDDING_PROVIDER", "hashing")
+
+import pytest
+
+from utils.resilience import CircuitOpenError, ResiliencePolicy
+
+
+class Unavailable(Exception):
+    """Retryable backend failure"""
+    status_code = 503
+
+
+def _fail(error: Exception):
+    raise error
+
+
+def _open_policy() -> ResiliencePolicy:
+    """Policy whose breaker has just opened and is ready for a trial call"""
+    policy = ResiliencePolicy("test", retries=0, breaker_failures=1, breaker_reset_seconds=0)
+    with pytest.raises(Unavailable):
+        policy.call(_fail, Unavailable())
+    assert policy.breaker.state == "open"
+    return policy
+
+
+def test_non_retryable_trial_failure_reopens_circuit():
+    policy = _open_policy()
+
+    with pytest.raises(ValueError):
+        policy.call(_fail, ValueError("bad argument"))
+    assert policy.breaker.state == "open"
+
+    # The next trial is let through and closes the circuit on success
+    assert policy.call(lambda: "ok") == "ok"
+    assert policy.breaker.state == "closed"
+
+
+def test_non_retryable_failure_does_not_open_closed_circuit():
+    policy = ResiliencePolicy("test", retries=0, breaker_failures=1, breaker_reset_seconds=30)
+
+    with pytest.raises(ValueError):
+        policy.call(_fail, ValueError("bad argument"))
+    assert policy.breaker.state == "closed"
+
+    with pytest.raises(Unavailable):
+        policy.call(_fail, Unavailable())
+    with pytest.raises(CircuitOpenError):
+        policy.call(lambda: "ok")
@@ -16,28 +16,273 @@ class Config:
 
     # Qdrant
     QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
-    QDRANT_URL = os.getenv("QDRANT_URL")
+    # Comma-separated: the first URL is the primary (all writes), the others
+    # are read replicas; searches are spread over all healthy nodes
+    QDRANT_URLS = [url.strip() for url in os.getenv("QDRANT_URL", "").split(",") if url.strip()]
+    QDRANT_URL = QDRANT_URLS[0] if QDRANT_URLS else None
+    QDRANT_HEALTH_CHECK_SECONDS = float(os.getenv("QDRANT_HEALTH_CHECK_SECONDS", "10"))
+    QDRANT_FAILURE_THRESHOLD = int(os.getenv("QDRANT_FAILURE_THRESHOLD", "3"))
+    QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", "20"))
+    QDRANT_KEEPALIVE_SECONDS = float(os.getenv("QDRANT_KEEPALIVE_SECONDS", "60"))
+    QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "10"))
+    # Use gRPC (port QDRANT_GRPC_PORT) instead of REST for searches and upserts
+    QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+    QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
 
     # Model settings
     EMBEDDING_MODEL = "text-embedding-3-small"
     CHAT_MODEL = "gpt-4o-mini"
 
+    # Embedding backend: "openai", "local" (sentence-transformers model at
+    # EMBEDDING_MODEL_PATH) or "hashing" (deterministic, for tests/benchmarks)
+    EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai")
+    EMBEDDING_MODEL_PATH = os.getenv("EMBEDDING_MODEL_PATH")
+    EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE", "cpu")
+
     # Vector DB settings
+    # Per-collection options:
+    #   search_dimensions: store a truncated (Matryoshka) vector of this size
+    #       for the first-pass search next to the full vector (kept on disk);
+    #       None stores a single full-size vector. Ignored unless the embedding
+    #       model supports truncation (text-embedding-3-*) and the size is
+    #       below EMBEDDING_DIMENSIONS
+    #   rescore: re-rank first-pass candidates against the full vectors
+    #   prefetch_factor: first-pass candidates fetched per requested result
+    #   indexes: payload field -> index type ("keyword", "text", "float",
+    #       "integer", "bool" or "geo"); "text" fields are matched
+    #       case-insensitively by word in filters
+    # Performance profile (None keeps Qdrant defaults; apply changes to
+    # existing collections with `python -m database.qdrant_setup apply-profiles`):
+    #   quantization: "scalar" (int8, 4x smaller), "product" (16x) or "binary" (32x)
+    #   quantization_always_ram: keep quantized vectors in RAM even if originals are on disk
+    #   quantization_rescore / oversampling: re-rank oversampled quantized hits with originals
+    #   hnsw_m / hnsw_ef_construct: HNSW graph degree and build-time beam width
+    #   hnsw_ef: search-time beam width (higher = better recall, slower)
+    #   on_disk / on_disk_payload: memory-map the searched vectors / payloads from disk
+    #   cache_ttl: seconds search results are cached (None uses SEARCH_CACHE_TTL_SECONDS, 0 disables)
+    #   keyword_index: build the exact name/location index (KEYWORD_INDEX_ENABLED)
     COLLECTIONS = {
-        "destinations": "Tourist destinations with descriptions",
-        "attractions": "Points of interest, attractions, sites",
-        "restaurants": "Restaurant recommendations",
-        "hotels": "Hotel and accommodation options"
+        "destinations": {
+            "description": "Tourist destinations with descriptions",
+            "cache_ttl": 3600,
+            "indexes": {
+                "region": "text",
+                "budget_level": "keyword",
+                "type": "keyword",
+                "rating": "float",
+            },
+        },
+        "attractions": {
+            "description": "Points of interest, attractions, sites",
+            "search_dimensions": 256,
+            "quantization": "scalar",
+            "oversampling": 2.0,
+            "indexes": {
+                "location": "text",
+                "type": "keyword",
+                "rating": "float",
+            },
+        },
+        "restaurants": {
+            "description": "Restaurant recommendations",
+            "search_dimensions": 256,
+            "quantization": "scalar",
+            "oversampling": 2.0,
+            "indexes": {
+                "location": "text",
+                "cuisine": "text",
+                "price_range": "keyword",
+                "rating": "float",
+            },
+        },
+        "hotels": {
+            "description": "Hotel and accommodation options",
+            "indexes": {
+                "location": "text",
+                "type": "keyword",
+                "price_range": "keyword",
+                "rating": "float",
+            },
+        },
+        # Semantic answer cache (agent/answer_cache.py)
+        "answer_cache": {
+            "description": "Cached concierge answers keyed by question and preferences",
+            "cache_ttl": 0,
+            "keyword_index": False,
+            "indexes": {
+                "context": "keyword",
+                "sources": "keyword",
+                "expires_at": "float",
+            },
+        },
+    }
+
+    COLLECTION_DEFAULTS = {
+        "description": "",
+        "search_dimensions": None,
+        "rescore": True,
+        "prefetch_factor": 4,
+        "indexes": {},
+        "quantization": None,
+        "quantization_always_ram": True,
+        "quantization_rescore": True,
+        "oversampling": None,
+        "hnsw_m": None,
+        "hnsw_ef_construct": None,
+        "hnsw_ef": None,
+        "on_disk": False,
+        "on_disk_payload": False,
+        "cache_ttl": None,
+        "keyword_index": True,
+    }
+
+    # Embedding dimensions (openai/hashing; local models report their own size)
+    EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "1536"))  # for text-embedding-3-small
+
+    # Embedding cache (in-process LRU + on-disk SQLite store)
+    EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", ".cache/embeddings.sqlite3")
+    EMBEDDING_CACHE_MEMORY_SIZE = int(os.getenv("EMBEDDING_CACHE_MEMORY_SIZE", "2048"))
+    EMBEDDING_CACHE_DISK_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_DISK_MAX_ENTRIES", "100000"))
+
+    # Coalesce concurrent single-text embedding requests (0 disables)
+    EMBEDDING_COALESCE_WINDOW_MS = float(os.getenv("EMBEDDING_COALESCE_WINDOW_MS", "5"))
+    EMBEDDING_COALESCE_MAX_BATCH = int(os.getenv("EMBEDDING_COALESCE_MAX_BATCH", "64"))
+
+    # Embed all tool query templates in the background when the agent starts
+    EMBEDDING_WARMUP_ON_STARTUP = os.getenv("EMBEDDING_WARMUP_ON_STARTUP", "false").lower() == "true"
+
+    # Bulk ingestion
+    EMBEDDING_BATCH_MAX_TOKENS = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", "50000"))
+    EMBEDDING_BATCH_MAX_ITEMS = int(os.getenv("EMBEDDING_BATCH_MAX_ITEMS", "256"))
+    INGEST_MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "4"))
+    UPSERT_CHUNK_SIZE = int(os.getenv("UPSERT_CHUNK_SIZE", "256"))
+    SCROLL_PAGE_SIZE = int(os.getenv("SCROLL_PAGE_SIZE", "256"))
+
+    # In-process search mirrors: comma-separated collections whose vectors are
+    # held in RAM and searched locally (refreshed every MIRROR_REFRESH_SECONDS
+    # and after writes through QdrantManager). Collections larger than
+    # MIRROR_MAX_POINTS are not mirrored.
+    MIRROR_COLLECTIONS = [
+        name.strip() for name in os.getenv("MIRROR_COLLECTIONS", "").split(",") if name.strip()
+    ]
+    MIRROR_REFRESH_SECONDS = float(os.getenv("MIRROR_REFRESH_SECONDS", "300"))
+    MIRROR_MAX_POINTS = int(os.getenv("MIRROR_MAX_POINTS", "20000"))
+
+    # Answer queries that only name a known place/entity ("attractions in El Jem")
+    # from an in-process index over payload name/location, skipping vector search
+    KEYWORD_INDEX_ENABLED = os.getenv("KEYWORD_INDEX_ENABLED", "true").lower() == "true"
+
+    # Search result cache (invalidated by writes through QdrantManager)
+    SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+    SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024"))
+    SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300"))
+
+    # Answer simple currency, weather and "tell me about <destination>" requests
+    # from templates without calling the LLM (agent/router.py)
+    INTENT_ROUTER_ENABLED = os.getenv("INTENT_ROUTER_ENABLED", "true").lower() == "true"
+
+    # Semantic answer cache: reuse answers to near-identical questions asked
+    # with the same preferences (entries expire, and are dropped when a
+    # collection they were built from is written)
+    ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+    ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+    ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "86400"))
+
+    # Conversation memory (agent/memory.py): recent turns are sent verbatim up to
+    # MEMORY_RECENT_TOKENS, older turns are folded into a rolling summary
+    MEMORY_RECENT_TOKENS = int(os.getenv("MEMORY_RECENT_TOKENS", "1500"))
+    MEMORY_MESSAGE_TOKENS = int(os.getenv("MEMORY_MESSAGE_TOKENS", "600"))
+    MEMORY_SUMMARY_WORDS = int(os.getenv("MEMORY_SUMMARY_WORDS", "150"))
+
+    # Agent tool calls from one model turn run concurrently
+    TOOL_MAX_WORKERS = int(os.getenv("TOOL_MAX_WORKERS", "8"))
+    TOOL_TIMEOUT_SECONDS = float(os.getenv("TOOL_TIMEOUT_SECONDS", "20"))
+
+    # Compact tool results fed back to the model (agent/tool_output.py)
+    #   fields: payload fields fetched and returned, in output order
+    #   max_tokens: cap for one tool result (trailing results are dropped)
+    #   description_chars: descriptions are cut to this length
+    #   list_items: max items kept from list fields (activities, amenities...)
+    TOOL_OUTPUT_DEFAULTS = {
+        "fields": None,
+        "max_tokens": int(os.getenv("TOOL_OUTPUT_MAX_TOKENS", "400")),
+        "description_chars": 160,
+        "list_items": 4,
+    }
+    TOOL_OUTPUTS = {
+        "search_destinations_tool": {
+            "fields": ["name", "region", "description", "best_season", "activities", "budget_level"],
+        },
+        "get_attractions_tool": {
+            "fields": ["name", "type", "location", "description", "rating", "opening_hours", "entry_fee"],
+        },
+        "recommend_restaurants_tool": {
+            "fields": ["name", "cuisine", "location", "description", "price_range", "rating", "specialties"],
+        },
+        "recommend_hotels_tool": {
+            "fields": ["name", "type", "location", "description", "price_range", "rating", "amenities"],
+        },
+        "create_itinerary_tool": {
+            "fields": ["name", "type", "description", "cuisine"],
+            "max_tokens": int(os.getenv("ITINERARY_OUTPUT_MAX_TOKENS", "800")),
+            "description_chars": 100,
+        },
     }
 
-    # Embedding dimensions
-    EMBEDDING_DIMENSIONS = 1536  # for text-embedding-3-small
+    # Resilience policies for remote calls (utils/resilience.py)
+    #   deadline: seconds for the whole call including retries (None = no limit)
+    #   retries / backoff / max_backoff: extra attempts with full-jitter exponential backoff
+    #   hedge: send a duplicate request once an attempt exceeds the observed
+    #       hedge_quantile latency (after hedge_min_samples calls)
+    #   breaker_failures / breaker_reset_seconds: fail fast after this many
+    #       failed calls in a row, for this long (0 disables the breaker)
+    RESILIENCE_ENABLED = os.getenv("RESILIENCE_ENABLED", "true").lower() == "true"
+    RESILIENCE_MAX_WORKERS = int(os.getenv("RESILIENCE_MAX_WORKERS", "32"))
+    RESILIENCE_POLICIES = {
+        # Query embeddings; bulk batches (ingestion, warm-up) are far slower
+        # than the query p95, so they are neither hedged nor given its deadline
+        "embeddings": {"deadline": 15, "retries": 2, "hedge": True},
+        "embeddings_bulk": {"retries": 3, "backoff": 1.0, "max_backoff": 10.0},
+        # QDRANT_TIMEOUT bounds each attempt; the deadline leaves room for the retries
+        "qdrant_search": {"deadline": QDRANT_TIMEOUT * 3, "retries": 2, "hedge": True},
+        "qdrant_scroll": {"retries": 2},
+        "qdrant_write": {"retries": 3, "backoff": 0.5},
+        "weather": {"deadline": 8, "retries": 1, "hedge": True},
+    }
+    RESILIENCE_DEFAULTS = {
+        "deadline": None,
+        "retries": 2,
+        "backoff": 0.1,
+        "max_backoff": 2.0,
+        "hedge": False,
+        "hedge_quantile": 0.95,
+        "hedge_min_samples": 20,
+        "hedge_min_delay": 0.02,
+        "breaker_failures": 5,
+        "breaker_reset_seconds": 30,
+    }
+
+    @classmethod
+    def resilience_settings(cls, name: str) -> dict:
+        """Resilience policy settings, with defaults filled in"""
+        return {**cls.RESILIENCE_DEFAULTS, **cls.RESILIENCE_POLICIES.get(name, {})}
+
+    @classmethod
+    def tool_output_settings(cls, tool_name: str) -> dict:
+        """Output settings for an agent tool, with defaults filled in"""
+        return {**cls.TOOL_OUTPUT_DEFAULTS, **cls.TOOL_OUTPUTS.get(tool_name, {})}
+
+    @classmethod
+    def collection_settings(cls, collection_name: str) -> dict:
+        """Settings for a collection, with defaults filled in"""
+        return {**cls.COLLECTION_DEFAULTS, **cls.COLLECTIONS.get(collection_name, {})}
 
     @classmethod
     def validate(cls):
         """Validate required configuration"""
         missing = []
-        if not cls.OPENAI_API_KEY:
+        if cls.EMBEDDING_PROVIDER == "openai" and not cls.OPENAI_API_KEY:
             missing.append("OPENAI_API_KEY")
         if not cls.QDRANT_API_KEY:
             missing.append("QDRANT_API_KEY")
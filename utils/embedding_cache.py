@@ -0,0 +1,181 @@
+"""
+Two-tier embedding cache: in-process LRU backed by an on-disk SQLite store
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+def embedding_cache_key(model: str, dimensions: int, text: str) -> str:
+    """Content-addressed key for an embedding (model + dimensions + text)"""
+    raw = f"{model}\x00{dimensions}\x00{text}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    In-process LRU in front of a persistent SQLite store.
+
+    Vectors are stored on disk as packed float32 blobs. Both tiers are
+    size-bounded: the memory tier evicts least recently used entries and the
+    disk tier evicts least recently accessed rows once it grows past
+    `disk_max_entries`.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_size: int = 2048,
+        disk_max_entries: int = 100_000
+    ):
+        self.memory_size = memory_size
+        self.disk_max_entries = disk_max_entries
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0
+        }
+
+        self._db = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_accessed ON embeddings(accessed)"
+            )
+            self._db.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Look up keys in memory, then on disk. Returns only the hits."""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    self._stats["memory_hits"] += 1
+                else:
+                    missing.append(key)
+
+            if missing and self._db is not None:
+                rows = []
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows.extend(self._db.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                        chunk
+                    ).fetchall())
+
+                now = time.time()
+                for key, blob in rows:
+                    vector = array("f", blob).tolist()
+                    found[key] = vector
+                    self._remember(key, vector)
+                    self._stats["disk_hits"] += 1
+
+                if rows:
+                    self._db.executemany(
+                        "UPDATE embeddings SET accessed = ? WHERE key = ?",
+                        [(now, key) for key, _ in rows]
+                    )
+                    self._db.commit()
+
+            self._stats["misses"] += len(set(keys) - set(found))
+
+        return found
+
+    def contains_many(self, keys: List[str]) -> set:
+        """Keys present in either tier (does not touch LRU order or counters)"""
+        with self._lock:
+            present = {key for key in keys if key in self._memory}
+            missing = [key for key in keys if key not in present]
+            if self._db is not None:
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    present.update(row[0] for row in self._db.execute(
+                        f"SELECT key FROM embeddings WHERE key IN ({placeholders})",
+                        chunk
+                    ))
+        return present
+
+    def put_many(self, items: Dict[str, List[float]]):
+        """Store vectors in both tiers"""
+        if not items:
+            return
+
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+
+            if self._db is not None:
+                now = time.time()
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, accessed) VALUES (?, ?, ?)",
+                    [(key, array("f", vector).tobytes(), now) for key, vector in items.items()]
+                )
+                self._evict_disk()
+                self._db.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss and eviction counters plus current tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_entries"] = (
+                self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+                if self._db is not None else 0
+            )
+
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        )
+        return stats
+
+    def clear(self):
+        """Drop every cached vector from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+    def _remember(self, key: str, vector: List[float]):
+        """Insert into the memory tier (caller holds the lock)"""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+            self._stats["memory_evictions"] += 1
+
+    def _evict_disk(self):
+        """Trim the disk tier to `disk_max_entries` (caller holds the lock)"""
+        count = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = count - self.disk_max_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                "SELECT key FROM embeddings ORDER BY accessed ASC LIMIT ?)",
+                (overflow,)
+            )
+            self._stats["disk_evictions"] += overflow
@@ -0,0 +1,138 @@
+"""
+Embedding backends: OpenAI API, local sentence-transformers, deterministic hashing
+"""
+
+import hashlib
+import math
+import re
+from typing import List, Optional
+
+from utils.config import Config
+
+
+class EmbeddingProvider:
+    """Interface for embedding backends"""
+
+    # Identifies the backend and model in cache keys
+    name: str = ""
+    # Output vector size
+    dimensions: int = 0
+    # Whether a prefix of a vector is itself a usable embedding (Matryoshka training)
+    truncatable: bool = False
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts"""
+        raise NotImplementedError
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """OpenAI embeddings API"""
+
+    def __init__(self, model: str, dimensions: int, api_key: Optional[str] = None):
+        from openai import OpenAI
+
+        # Retries are handled by the "embeddings" resilience policy
+        self.client = OpenAI(api_key=api_key, max_retries=0 if Config.RESILIENCE_ENABLED else 2)
+        self.model = model
+        self.dimensions = dimensions
+        self.name = f"openai:{model}"
+        self.truncatable = model.startswith("text-embedding-3")
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        kwargs = {}
+        # text-embedding-3 models can return shortened vectors natively
+        if self.model.startswith("text-embedding-3"):
+            kwargs["dimensions"] = self.dimensions
+
+        response = self.client.embeddings.create(
+            model=self.model,
+            input=texts,
+            **kwargs
+        )
+
+        return [item.embedding for item in response.data]
+
+
+class SentenceTransformerProvider(EmbeddingProvider):
+    """Local in-process model loaded with sentence-transformers (CPU by default)"""
+
+    def __init__(self, model_path: str, device: str = "cpu"):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "EMBEDDING_PROVIDER=local requires sentence-transformers: "
+                "`pip install sentence-transformers`"
+            ) from e
+
+        self.model = SentenceTransformer(model_path, device=device)
+        self.dimensions = self.model.get_sentence_embedding_dimension()
+        self.name = f"local:{model_path}"
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(texts, normalize_embeddings=True)
+        return vectors.tolist()
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic feature-hashing embedder.
+
+    Word tokens and character trigrams are hashed into signed buckets and the
+    result is L2-normalized. No model or network access; intended for tests
+    and offline benchmarking, not for retrieval quality.
+    """
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+        self.name = f"hashing:{dimensions}"
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        words = re.findall(r"\w+", text.lower())
+        features = words + [
+            word[i:i + 3] for word in words for i in range(max(1, len(word) - 2))
+        ]
+
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimensions] += sign
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+
+def create_provider(name: Optional[str] = None) -> EmbeddingProvider:
+    """
+    Create the embedding backend selected by Config.EMBEDDING_PROVIDER.
+
+    Args:
+        name: Override the configured backend ("openai", "local" or "hashing")
+
+    Returns:
+        EmbeddingProvider instance
+    """
+    name = (name or Config.EMBEDDING_PROVIDER).lower()
+
+    if name == "openai":
+        return OpenAIEmbeddingProvider(
+            model=Config.EMBEDDING_MODEL,
+            dimensions=Config.EMBEDDING_DIMENSIONS,
+            api_key=Config.OPENAI_API_KEY
+        )
+    if name == "local":
+        if not Config.EMBEDDING_MODEL_PATH:
+            raise ValueError("EMBEDDING_PROVIDER=local requires EMBEDDING_MODEL_PATH")
+        return SentenceTransformerProvider(
+            model_path=Config.EMBEDDING_MODEL_PATH,
+            device=Config.EMBEDDING_DEVICE
+        )
+    if name == "hashing":
+        return HashingEmbeddingProvider(dimensions=Config.EMBEDDING_DIMENSIONS)
+
+    raise ValueError(f"Unknown embedding provider: {name}")
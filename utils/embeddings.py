@@ -1,40 +1,234 @@
 """
-Embedding utilities using OpenAI
+Embedding utilities (backend selected by Config.EMBEDDING_PROVIDER)
 """
 
-from openai import OpenAI
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Tuple
 from utils.config import Config
+from utils.embedding_cache import EmbeddingCache, embedding_cache_key
+from utils.embedding_providers import create_provider
+from utils.resilience import get_policy
 
-client = OpenAI(api_key=Config.OPENAI_API_KEY)
+provider = create_provider()
 
+cache = EmbeddingCache(
+    path=Config.EMBEDDING_CACHE_PATH,
+    memory_size=Config.EMBEDDING_CACHE_MEMORY_SIZE,
+    disk_max_entries=Config.EMBEDDING_CACHE_DISK_MAX_ENTRIES
+) if Config.EMBEDDING_CACHE_ENABLED else None
 
-def get_embeddings(texts: list[str]) -> list[list[float]]:
+
+def _create_embeddings(texts: list[str], bulk: bool = False) -> list[list[float]]:
+    """
+    Call the embedding backend (no caching).
+
+    Query-sized requests go through the hedged "embeddings" policy; bulk
+    batches (ingestion, warm-up) through "embeddings_bulk", which neither
+    hedges nor has a deadline sized for single queries.
     """
-    Get embeddings for a list of texts using OpenAI.
+    return get_policy("embeddings_bulk" if bulk else "embeddings").call(provider.embed, texts)
+
+
+def get_embedding_dimensions() -> int:
+    """Output size of the configured embedding backend"""
+    return provider.dimensions
+
+
+def embedding_truncatable() -> bool:
+    """Whether the configured embeddings can be truncated for reduced-dimension search"""
+    return provider.truncatable
+
+
+def embedding_provider_name() -> str:
+    """Identifier of the configured embedding backend and model"""
+    return provider.name
+
+
+def _cache_key(text: str) -> str:
+    """Embedding cache key for a text under the current model settings"""
+    return embedding_cache_key(provider.name, provider.dimensions, text)
+
+
+def _embed_and_store(missing: Dict[str, str], bulk: bool = False) -> Dict[str, list[float]]:
+    """Embed {cache key: text} in one request and write the results to the cache"""
+    vectors = _create_embeddings(list(missing.values()), bulk)
+    fresh = dict(zip(missing.keys(), vectors))
+    if cache is not None:
+        cache.put_many(fresh)
+    return fresh
+
+
+class EmbeddingCoalescer:
+    """
+    Micro-batches concurrent single-text embedding requests.
+
+    Callers block on a future while a background worker collects requests for
+    up to `window_ms` (or until `max_batch` texts are queued) and sends them
+    as a single embeddings request.
+    """
+
+    def __init__(self, window_ms: float, max_batch: int):
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Tuple[str, str, Future]]" = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def embed(self, key: str, text: str) -> list[float]:
+        """Queue a text for the next batch and wait for its vector"""
+        future = Future()
+        self._queue.put((key, text, future))
+        self._ensure_worker()
+        return future.result()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-coalescer", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            missing = {key: text for key, text, _ in batch}
+            try:
+                vectors = _embed_and_store(missing)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for key, _, future in batch:
+                future.set_result(vectors[key])
+
+
+coalescer = EmbeddingCoalescer(
+    window_ms=Config.EMBEDDING_COALESCE_WINDOW_MS,
+    max_batch=Config.EMBEDDING_COALESCE_MAX_BATCH
+) if Config.EMBEDDING_COALESCE_WINDOW_MS > 0 else None
+
+
+def get_embeddings(texts: list[str], bulk: bool = False) -> list[list[float]]:
+    """
+    Get embeddings for a list of texts using the configured backend.
+
+    Cached vectors are served from the embedding cache; only the misses are
+    sent to the API, in a single request.
 
     Args:
         texts: List of text strings to embed
+        bulk: Large batch (ingestion, warm-up) rather than search queries;
+            uses the unhedged "embeddings_bulk" resilience policy
 
     Returns:
         List of embedding vectors
     """
-    response = client.embeddings.create(
-        model=Config.EMBEDDING_MODEL,
-        input=texts
-    )
+    if cache is None:
+        return _create_embeddings(texts, bulk)
+
+    keys = [_cache_key(text) for text in texts]
+    found = cache.get_many(keys)
 
-    return [item.embedding for item in response.data]
+    # Embed each distinct missing text once
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+
+    if missing:
+        found.update(_embed_and_store(missing, bulk))
+
+    return [found[key] for key in keys]
 
 
 def get_embedding(text: str) -> list[float]:
     """
     Get embedding for a single text.
 
+    Cache misses are coalesced with concurrent calls from other threads into
+    a single API request when the coalescer is enabled.
+
     Args:
         text: Text string to embed
 
     Returns:
         Embedding vector
     """
-    result = get_embeddings([text])
-    return result[0]
+    if coalescer is None:
+        return get_embeddings([text])[0]
+
+    key = _cache_key(text)
+    if cache is not None:
+        found = cache.get_many([key])
+        if key in found:
+            return found[key]
+
+    return coalescer.embed(key, text)
+
+
+def cached_texts(texts: list[str]) -> list[bool]:
+    """Whether each text already has a cached embedding"""
+    if cache is None:
+        return [False] * len(texts)
+    keys = [_cache_key(text) for text in texts]
+    present = cache.contains_many(keys)
+    return [key in present for key in keys]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)"""
+    return len(text) // 4 + 1
+
+
+def batch_texts(
+    texts: list[str],
+    max_tokens: int = None,
+    max_items: int = None
+) -> List[Tuple[int, int]]:
+    """
+    Split texts into consecutive batches that fit an embedding request.
+
+    Args:
+        texts: Texts to embed
+        max_tokens: Estimated token budget per batch
+        max_items: Maximum number of texts per batch
+
+    Returns:
+        List of (start, end) index ranges into `texts`
+    """
+    max_tokens = max_tokens or Config.EMBEDDING_BATCH_MAX_TOKENS
+    max_items = max_items or Config.EMBEDDING_BATCH_MAX_ITEMS
+
+    batches = []
+    start, tokens = 0, 0
+    for i, text in enumerate(texts):
+        cost = estimate_tokens(text)
+        if i > start and (tokens + cost > max_tokens or i - start >= max_items):
+            batches.append((start, i))
+            start, tokens = i, 0
+        tokens += cost
+
+    if start < len(texts):
+        batches.append((start, len(texts)))
+
+    return batches
+
+
+def get_embedding_cache_stats() -> Dict[str, float]:
+    """Hit/miss counters for the embedding cache (empty if disabled)"""
+    return cache.stats() if cache is not None else {}
@@ -0,0 +1,258 @@
+"""
+Resilience policies for remote calls: deadlines, retries, hedging, circuit breakers
+
+Each named policy (Config.RESILIENCE_POLICIES) wraps one kind of call, e.g.
+"embeddings" or "qdrant_search":
+
+- deadline: total time budget for the call including retries
+- retries: extra attempts after a retryable failure, with full-jitter
+  exponential backoff (only use for idempotent calls)
+- hedge: if an attempt is still running after the policy's observed p95
+  latency, send a duplicate and take whichever finishes first
+- circuit breaker: after `breaker_failures` failed calls in a row, fail fast
+  with CircuitOpenError for `breaker_reset_seconds`, then let one trial
+  call through
+
+Counters for every policy are available from `resilience_stats()`.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional, TypeVar
+
+from utils.config import Config
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the backend while a circuit breaker is open"""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call does not finish within its deadline"""
+
+
+def is_retryable(error: Exception) -> bool:
+    """Transient failures only: not client errors (4xx other than 408/429) or bad arguments"""
+    if isinstance(error, (CircuitOpenError, ValueError, TypeError, KeyError)):
+        return False
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int) and 400 <= status < 500 and status not in (408, 429):
+        return False
+    return True
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial call"""
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go through now"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self.state = "closed"
+
+    def record_failure(self) -> bool:
+        """Count a failed call; returns True if this opened the circuit"""
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or (
+                self.state == "closed" and self._failures >= self.failure_threshold
+            ):
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+
+class ResiliencePolicy:
+    """Deadline, retry, hedging and circuit breaker settings for one kind of call"""
+
+    def __init__(
+        self,
+        name: str,
+        deadline: Optional[float] = None,
+        retries: int = 2,
+        backoff: float = 0.1,
+        max_backoff: float = 2.0,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        hedge_min_delay: float = 0.02,
+        breaker_failures: int = 5,
+        breaker_reset_seconds: float = 30
+    ):
+        self.name = name
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self.breaker = CircuitBreaker(breaker_failures, breaker_reset_seconds) if breaker_failures else None
+
+        self._latencies = deque(maxlen=256)
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0, "successes": 0, "failures": 0, "retries": 0, "hedges": 0,
+            "hedge_wins": 0, "timeouts": 0, "short_circuits": 0, "circuit_opens": 0
+        }
+
+    def call(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run `fn(*args, **kwargs)` under this policy.
+
+        Raises:
+            CircuitOpenError: The circuit is open
+            DeadlineExceeded: The deadline passed before a successful attempt
+            Exception: The last error from `fn` once retries are exhausted
+        """
+        if not Config.RESILIENCE_ENABLED:
+            return fn(*args, **kwargs)
+
+        self._count("calls")
+        if self.breaker is not None and not self.breaker.allow():
+            self._count("short_circuits")
+            raise CircuitOpenError(f"{self.name}: circuit open, failing fast")
+        # The single call let through after the reset period
+        trial = self.breaker is not None and self.breaker.state == "half_open"
+
+        deadline_at = time.monotonic() + self.deadline if self.deadline else None
+        attempt = 0
+        while True:
+            try:
+                result = self._attempt(fn, args, kwargs, deadline_at)
+            except Exception as e:
+                if isinstance(e, DeadlineExceeded):
+                    self._count("timeouts")
+                retryable = is_retryable(e)
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+                out_of_time = deadline_at is not None and time.monotonic() + delay >= deadline_at
+                if not retryable or attempt >= self.retries or out_of_time:
+                    self._count("failures")
+                    # Client errors say nothing about the backend's health, but a
+                    # failed trial call must still settle the half-open breaker
+                    if (retryable or trial) and self.breaker is not None and self.breaker.record_failure():
+                        self._count("circuit_opens")
+                        print(f"Circuit opened for {self.name}: {e}")
+                    raise
+                attempt += 1
+                self._count("retries")
+                time.sleep(delay)
+                continue
+
+            self._count("successes")
+            if self.breaker is not None:
+                self.breaker.record_success()
+            return result
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds before sending a hedged duplicate (None until enough latencies are known)"""
+        with self._lock:
+            if not self.hedge or len(self._latencies) < self.hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(self.hedge_quantile * len(ordered)))
+        return max(self.hedge_min_delay, ordered[index])
+
+    def stats(self) -> Dict[str, float]:
+        """Counters, latency percentiles (ms) and breaker state"""
+        with self._lock:
+            stats = dict(self._stats)
+            ordered = sorted(self._latencies)
+        for quantile in (50, 95, 99):
+            stats[f"p{quantile}_ms"] = (
+                ordered[min(len(ordered) - 1, quantile * len(ordered) // 100)] * 1000
+                if ordered else None
+            )
+        stats["circuit"] = self.breaker.state if self.breaker is not None else None
+        return stats
+
+    def _attempt(self, fn: Callable, args, kwargs, deadline_at: Optional[float]):
+        """One attempt, hedged and bounded by the deadline where configured"""
+        hedge_delay = self.hedge_delay()
+        start = time.perf_counter()
+
+        if deadline_at is None and hedge_delay is None:
+            result = fn(*args, **kwargs)
+            self._record_latency(time.perf_counter() - start)
+            return result
+
+        primary = _executor.submit(fn, *args, **kwargs)
+        futures = [primary]
+        if hedge_delay is not None:
+            timeout = hedge_delay if deadline_at is None else min(hedge_delay, deadline_at - time.monotonic())
+            done, _ = wait(futures, timeout=max(0.0, timeout))
+            if not done and (deadline_at is None or time.monotonic() < deadline_at):
+                self._count("hedges")
+                futures.append(_executor.submit(fn, *args, **kwargs))
+
+        pending = set(futures)
+        error = None
+        while pending:
+            timeout = None if deadline_at is None else max(0.0, deadline_at - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded(f"{self.name}: no response within {self.deadline}s")
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        self._count("hedge_wins")
+                    self._record_latency(time.perf_counter() - start)
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _record_latency(self, seconds: float):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._stats[counter] += 1
+
+
+# Runs attempts that need a deadline or a hedge (the caller waits on futures)
+_executor = ThreadPoolExecutor(
+    max_workers=Config.RESILIENCE_MAX_WORKERS, thread_name_prefix="resilience"
+)
+_policies: Dict[str, ResiliencePolicy] = {}
+_policies_lock = threading.Lock()
+
+
+def get_policy(name: str) -> ResiliencePolicy:
+    """Shared policy configured by Config.RESILIENCE_POLICIES[name] (created on first use)"""
+    if name not in _policies:
+        with _policies_lock:
+            if name not in _policies:
+                _policies[name] = ResiliencePolicy(name, **Config.resilience_settings(name))
+    return _policies[name]
+
+
+def resilience_stats() -> Dict[str, Dict[str, float]]:
+    """Counters for every policy used so far"""
+    return {name: policy.stats() for name, policy in list(_policies.items())}